@@ -6,6 +6,20 @@ import re
 from loguru import logger
 from models.file_conversion_models import FileMetadata
 
+# Patterns used by _clean_text. The control class covers C0/C1 (except
+# newline), the BMP format characters (soft hyphen, zero-width and bidi
+# marks, BOM, ...), lone surrogates and the BMP private use area
+_RE_CONTROL = re.compile(
+    r'[\x00-\x09\x0b-\x1f\x7f-\x9f\u00ad\u0600-\u0605\u061c\u06dd\u070f\u0890\u0891'
+    r'\u08e2\u180e\u200b-\u200f\u2028-\u202e\u2060-\u206f\ud800-\udfff\ue000-\uf8ff'
+    r'\ufeff\ufff9-\ufffb]'
+)
+# ASCII control characters except newline; str.translate takes a C fast path
+# for ASCII text but is slower than the regex once the text is not ASCII
+_ASCII_CONTROL_TABLE = str.maketrans({c: ' ' for c in (*range(0x0a), *range(0x0b, 0x20), 0x7f)})
+_RE_SPACES = re.compile(r'[^\S\n]+')
+_RE_NEWLINES = re.compile(r'\n{3,}')
+
 @dataclass
 class ConversionContext:
     """Holds context information during conversion process"""
@@ -36,16 +50,23 @@ class BaseDocumentConverter(ABC):
         """Clean and normalize text content"""
         if not text:
             return ""
-            
-        # Remove control characters except newlines and tabs
-        text = ''.join(char if char in '\n\t' or not unicodedata.category(char).startswith('C') 
-                      else ' ' for char in text)
+        
+        # Fold compatibility forms (fullwidth, ligatures, NBSP); the quick
+        # check skips the copy for text that is already NFKC
+        if not unicodedata.is_normalized('NFKC', text):
+            text = unicodedata.normalize('NFKC', text)
+        
+        # Replace control and format characters except newlines
+        if text.isascii():
+            text = text.translate(_ASCII_CONTROL_TABLE)
+        else:
+            text = _RE_CONTROL.sub(' ', text)
         
         # Normalize whitespace
-        text = re.sub(r'[^\S\n]+', ' ', text)
+        text = _RE_SPACES.sub(' ', text)
         
         # Normalize newlines (max 2 consecutive)
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = _RE_NEWLINES.sub('\n\n', text)
         
         # Remove whitespace at start/end of lines
         text = '\n'.join(line.strip() for line in text.split('\n'))
@@ -98,9 +98,12 @@ class EnhancedConversionService:
                 
             converter = converter_class()
             
-            # Convert file
+            # Convert file, handing the only reference to content to the
+            # converter so it can free the upload before building markdown
+            conversion = converter.convert(content, context)
+            del content
             try:
-                markdown_content, metadata = await converter.convert(content, context)
+                markdown_content, metadata = await conversion
             except Exception as e:
                 logger.error(f"Conversion error for {file.filename}: {str(e)}")
                 raise FileConversionException(f"Failed to convert {file_type.value}: {str(e)}")
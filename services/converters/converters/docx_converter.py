@@ -1,15 +1,23 @@
 import re
-from typing import Dict, Any, List, Tuple, Optional
+import asyncio
+import posixpath
+import zipfile
+from collections.abc import Mapping
+from typing import Dict, Any, Iterator, List, Tuple, Optional
 from docx import Document
 from docx.oxml import OxmlElement
-from docx.oxml.text.paragraph import CT_P
-from docx.oxml.table import CT_Tbl
+from docx.oxml.simpletypes import ST_Merge
 from docx.oxml.ns import qn
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.opc.coreprops import CoreProperties
+from docx.oxml.parser import element_class_lookup, parse_xml
+from docx.styles import BabelFish
 from docx.text.paragraph import Paragraph
 from docx.table import _Cell, Table
 from docx.shared import Pt, RGBColor
 import base64
 from io import BytesIO
+from lxml import etree
 from loguru import logger
 
 from ..base_converter import BaseDocumentConverter, ConversionContext
@@ -17,96 +25,347 @@ from ..document_structure import DocumentStructure, DocumentElement, ElementType
 from ..file_utils import FileUtils
 from models.file_conversion_models import FileMetadata, FileType
 
+# Namespace URIs for the prefixes used in this module
+NS = {
+    'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+    'wp': 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing',
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+    'pic': 'http://schemas.openxmlformats.org/drawingml/2006/picture',
+    'm': 'http://schemas.openxmlformats.org/officeDocument/2006/math',
+}
+
+# Clark-notation tag and attribute names, resolved once at import time
+W_R, W_T, W_RPR, W_B, W_I, W_U = map(qn, ('w:r', 'w:t', 'w:rPr', 'w:b', 'w:i', 'w:u'))
+W_VAL, W_SZ, W_COLOR = map(qn, ('w:val', 'w:sz', 'w:color'))
+W_RFONTS, W_ASCII = qn('w:rFonts'), qn('w:ascii')
+W_NUMPR, W_ILVL, W_NUMID = map(qn, ('w:numPr', 'w:ilvl', 'w:numId'))
+W_NUM, W_ABSTRACTNUM, W_ABSTRACTNUMID = map(qn, ('w:num', 'w:abstractNum', 'w:abstractNumId'))
+W_LVL, W_NUMFMT = qn('w:lvl'), qn('w:numFmt')
+W_BR = qn('w:br')
+
+# Run inner-content elements with a fixed text equivalent, as in CT_R.text
+_RUN_CONTENT_TEXT = {
+    qn('w:tab'): '\t',
+    qn('w:ptab'): '\t',
+    qn('w:cr'): '\n',
+    qn('w:noBreakHyphen'): '-',
+}
+
+# Numbering formats that render as unordered lists
+_UNORDERED_NUM_FORMATS = frozenset({'bullet', 'none'})
+
+# Fallback heuristic for list items without a numbering definition
+_ORDERED_ITEM_RE = re.compile(r'^\d+\.?\s')
+W_TBLBORDERS, W_JC, W_DRAWING = map(qn, ('w:tblBorders', 'w:jc', 'w:drawing'))
+A_BLIP, R_EMBED = qn('a:blip'), qn('r:embed')
+W_BODY, W_P, W_TBL, W_SECTPR = map(qn, ('w:body', 'w:p', 'w:tbl', 'w:sectPr'))
+W_STYLE, W_STYLEID, W_NAME, W_TYPE, W_DEFAULT = map(qn, ('w:style', 'w:styleId', 'w:name', 'w:type', 'w:default'))
+M_OMATH = '{%s}oMath' % NS['m']
+WP_EXTENT, WP_DOCPR, PIC_CNVPR = map(qn, ('wp:extent', 'wp:docPr', 'pic:cNvPr'))
+
+class _ZipImagePart:
+    """Image part read on demand from the docx package in streaming mode"""
+    
+    def __init__(self, package: zipfile.ZipFile, partname: str):
+        self._package = package
+        self.partname = partname
+    
+    @property
+    def blob(self) -> bytes:
+        return self._package.read(self.partname)
+
+class _LazyStyleInfo(Mapping):
+    """Paragraph style metadata whose fields are extracted on first access.
+    
+    Markdown rendering never reads paragraph style details, so extracting
+    indentation, spacing and font information eagerly for every paragraph
+    is wasted work. Each key is resolved once and then cached.
+    """
+    
+    _LOADERS = {
+        'name': '_style_name',
+        'alignment': '_style_alignment',
+        'indentation': '_style_indentation',
+        'spacing': '_style_spacing',
+        'font': '_style_font',
+    }
+    
+    def __init__(self, converter: 'DocxConverter', paragraph: Paragraph):
+        self._converter = converter
+        self._paragraph = paragraph
+        self._values: Dict[str, Any] = {}
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self._values:
+            return self._values[key]
+        loader = self._LOADERS[key]
+        try:
+            value = getattr(self._converter, loader)(self._paragraph)
+        except Exception as e:
+            self._converter.log_warning(f"Error extracting paragraph style: {str(e)}")
+            value = None if key in ('name', 'alignment') else {}
+        self._values[key] = value
+        return value
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._LOADERS)
+    
+    def __len__(self) -> int:
+        return len(self._LOADERS)
+
 class DocxConverter(BaseDocumentConverter):
     """Enhanced DOCX to Markdown converter with style preservation"""
     
+    # Documents larger than this are streamed instead of loaded with python-docx
+    STREAMING_THRESHOLD_BYTES = 10 * 1024 * 1024
+    _STREAM_CHUNK_SIZE = 64 * 1024
+    
     def __init__(self):
         super().__init__()
         self.structure = DocumentStructure()
         self.file_utils = FileUtils()
-        self._temp_files = []
         self._image_counter = 0
         self._current_list_id = None
-        self._current_list_level = 0
-        self._list_stack = []
+        self._list_stack: List[Tuple[int, DocumentElement]] = []
+        self._list_roots: List[DocumentElement] = []
+        self._image_parts: Dict[str, Any] = {}
+        self._image_b64_cache: Dict[Tuple[str, str], Optional[str]] = {}
+        self._numbering_formats: Dict[str, Dict[int, bool]] = {}
+        self._ordered_cache: Dict[Tuple[str, int], bool] = {}
+        self._style_names: Tuple[Dict[str, str], str] = ({}, 'Normal')
+        # Streamed elements are cleared after processing, so style info must
+        # be extracted before that rather than on first access
+        self._eager_style_info = False
         
     async def convert(self, content: bytes, context: ConversionContext) -> Tuple[str, FileMetadata]:
         """Convert DOCX file to markdown"""
         self.context = context
-        temp_path = None
         
         try:
-            # Create temporary file
-            temp_path = self.file_utils.create_temp_file(content, '.docx')
-            self._temp_files.append(temp_path)
-            
-            # Load document
-            doc = Document(temp_path)
+            # Parsing and walking the document is CPU-bound; keep it off the event loop
+            return await asyncio.to_thread(self._convert_sync, content, context)
             
-            # Process document metadata
-            self._add_document_metadata(doc)
-            
-            # Initialize counters for metadata
-            images_count = 0
-            tables_count = 0
-            equations_count = 0
+        except Exception as e:
+            logger.error(f"DOCX conversion error: {str(e)}")
+            raise
+    
+    def _convert_sync(self, content: bytes, context: ConversionContext) -> Tuple[str, FileMetadata]:
+        """Synchronous DOCX conversion, run in a worker thread by convert()"""
+        if len(content) > self.STREAMING_THRESHOLD_BYTES:
+            # Large documents: stream document.xml instead of building the full tree
+            pages, images_count, tables_count, equations_count = self._convert_streaming(content)
+        else:
+            pages, images_count, tables_count, equations_count = self._convert_document(content)
+        
+        # Convert to markdown
+        markdown_content = self.structure.to_markdown()
+        
+        # Create metadata
+        metadata = FileMetadata(
+            filename=context.filename,
+            size_bytes=context.size_bytes,
+            file_type=FileType.DOCX,
+            pages=pages,
+            images_count=images_count,
+            tables_count=tables_count,
+            equations_count=equations_count
+        )
+        
+        return markdown_content, metadata
+    
+    def _convert_document(self, content: bytes) -> Tuple[int, int, int, int]:
+        """Convert using a fully loaded python-docx Document.
+        
+        Returns (sections, images, tables, equations) counts.
+        """
+        # Load document straight from memory; python-docx accepts file-like objects
+        doc = Document(BytesIO(content))
+        
+        # Process document metadata
+        self._add_document_metadata(doc.core_properties)
+        
+        # Resolve image relationships once for the whole document
+        self._image_parts = self._collect_image_parts(doc)
+        try:
+            numbering_part = doc.part.part_related_by(RT.NUMBERING)
+        except KeyError:
+            # Documents without any lists carry no numbering part
+            self._numbering_formats = {}
+        else:
+            self._numbering_formats = self._build_numbering_formats(numbering_part.element)
+        self._style_names = self._build_style_names(doc.styles.element)
+        
+        # Process content
+        body_elements = [e for e in doc.element.body if e.tag == W_P or e.tag == W_TBL]
+        images_count, tables_count, equations_count = self._process_body_elements(body_elements, doc)
+        
+        return len(doc.sections), images_count, tables_count, equations_count
+    
+    def _process_body_elements(self, elements: List[Any], doc: Document) -> Tuple[int, int, int]:
+        """Process a run of top-level body elements.
+        
+        Images are emitted right after the paragraph or table containing them,
+        keeping document order. Returns (images, tables, equations) counts.
+        """
+        images_count = 0
+        tables_count = 0
+        equations_count = 0
+        
+        for element in elements:
+            if element.tag == W_P:
+                # Process paragraph
+                paragraph = Paragraph(element, doc)
+                if self._has_equation(element):
+                    equations_count += 1
+                self._process_paragraph(paragraph)
+                
+            else:
+                # Process table
+                table = Table(element, doc)
+                self._process_table(table)
+                tables_count += 1
             
-            # Process content
-            for element in doc.element.body:
-                if isinstance(element, CT_P):
-                    # Process paragraph
-                    paragraph = Paragraph(element, doc)
-                    if 'math' in paragraph._element.xml:
-                        equations_count += 1
-                    self._process_paragraph(paragraph)
-                    
-                elif isinstance(element, CT_Tbl):
-                    # Process table
-                    table = Table(element, doc)
-                    self._process_table(table)
-                    tables_count += 1
+            images_count += self._process_images(element)
+        self._close_current_list()
+        
+        return images_count, tables_count, equations_count
+    
+    def _convert_streaming(self, content: bytes) -> Tuple[int, int, int, int]:
+        """Convert by streaming the main document part through an incremental parser.
+        
+        Each top-level paragraph or table is processed as soon as it has been
+        parsed and is then cleared, so peak memory stays bounded by the largest
+        single body element rather than the whole document tree.
+        Returns (sections, images, tables, equations) counts.
+        """
+        counts = {'sections': 0, 'images': 0, 'tables': 0, 'equations': 0}
+        self._eager_style_info = True
+        
+        with zipfile.ZipFile(BytesIO(content)) as package:
+            package_rels = self._read_zip_rels(package, '')
+            main_part = next(
+                (target for reltype, target in package_rels.values() if reltype == RT.OFFICE_DOCUMENT),
+                'word/document.xml'
+            )
             
-            # Process images from all sources
-            images_count = self._process_images(doc)
+            core_part = next(
+                (target for reltype, target in package_rels.values() if reltype == RT.CORE_PROPERTIES),
+                None
+            )
+            if core_part in package.namelist():
+                self._add_document_metadata(CoreProperties(parse_xml(package.read(core_part))))
             
-            # Convert to markdown
-            markdown_content = self.structure.to_markdown()
+            # Resolve styles, numbering and image relationships of the main part
+            part_rels = self._read_zip_rels(package, main_part)
+            self._image_parts = {}
+            self._numbering_formats = {}
+            for r_id, (reltype, target) in part_rels.items():
+                if reltype == RT.IMAGE:
+                    self._image_parts[r_id] = _ZipImagePart(package, target)
+                elif reltype == RT.STYLES:
+                    self._style_names = self._build_style_names(parse_xml(package.read(target)))
+                elif reltype == RT.NUMBERING:
+                    self._numbering_formats = self._build_numbering_formats(parse_xml(package.read(target)))
             
-            # Create metadata
-            metadata = FileMetadata(
-                filename=context.filename,
-                size_bytes=context.size_bytes,
-                file_type=FileType.DOCX,
-                pages=len(doc.sections),
-                images_count=images_count,
-                tables_count=tables_count,
-                equations_count=equations_count
+            parser = etree.XMLPullParser(
+                events=('end',), tag=(W_P, W_TBL, W_SECTPR),
+                huge_tree=True, remove_blank_text=True, resolve_entities=False
             )
+            parser.set_element_class_lookup(element_class_lookup)
             
-            return markdown_content, metadata
-            
-        except Exception as e:
-            logger.error(f"DOCX conversion error: {str(e)}")
-            raise
-        finally:
-            # Cleanup temporary files
-            self.file_utils.cleanup_temp_files(self._temp_files)
+            with package.open(main_part) as stream:
+                for chunk in iter(lambda: stream.read(self._STREAM_CHUNK_SIZE), b''):
+                    parser.feed(chunk)
+                    for _, element in parser.read_events():
+                        self._process_streamed_element(element, counts)
+                parser.close()
+                for _, element in parser.read_events():
+                    self._process_streamed_element(element, counts)
+            self._close_current_list()
+        
+        return counts['sections'], counts['images'], counts['tables'], counts['equations']
+    
+    def _process_streamed_element(self, element, counts: Dict[str, int]) -> None:
+        """Process one element emitted by the streaming parser, then release it"""
+        if element.tag == W_SECTPR:
+            counts['sections'] += 1
+            return
+        
+        parent = element.getparent()
+        if parent is None or parent.tag != W_BODY:
+            # Nested paragraphs/tables are handled with their top-level container
+            return
+        
+        if element.tag == W_P:
+            if self._has_equation(element):
+                counts['equations'] += 1
+            self._process_paragraph(Paragraph(element, None))
+        else:
+            self._process_table(Table(element, None))
+            counts['tables'] += 1
+        counts['images'] += self._process_images(element)
+        
+        # Drop the processed element and everything before it
+        element.clear(keep_tail=True)
+        while element.getprevious() is not None:
+            del parent[0]
     
-    def _add_document_metadata(self, doc: Document) -> None:
+    @staticmethod
+    def _read_zip_rels(package: zipfile.ZipFile, partname: str) -> Dict[str, Tuple[str, str]]:
+        """Read internal relationships of a package part as rId -> (reltype, target partname)"""
+        base_dir, filename = posixpath.split(partname)
+        rels_name = posixpath.join(base_dir, '_rels', f'{filename}.rels')
+        if rels_name not in package.namelist():
+            return {}
+        
+        rels = {}
+        for rel in etree.fromstring(package.read(rels_name)):
+            if rel.get('TargetMode') == 'External':
+                continue
+            target = rel.get('Target', '')
+            if target.startswith('/'):
+                target = target.lstrip('/')
+            else:
+                target = posixpath.normpath(posixpath.join(base_dir, target))
+            rels[rel.get('Id')] = (rel.get('Type'), target)
+        return rels
+    
+    @staticmethod
+    def _build_style_names(styles) -> Tuple[Dict[str, str], str]:
+        """Map styleId -> UI style name, plus the default paragraph style name"""
+        names = {}
+        default_name = 'Normal'
+        for style in styles.iterchildren(W_STYLE):
+            name_elem = style.find(W_NAME)
+            if name_elem is None:
+                continue
+            name = BabelFish.internal2ui(name_elem.get(W_VAL))
+            names[style.get(W_STYLEID)] = name
+            if style.get(W_TYPE) == 'paragraph' and style.get(W_DEFAULT) in ('1', 'true'):
+                default_name = name
+        return names, default_name
+    
+    @staticmethod
+    def _has_equation(element) -> bool:
+        """Check whether an element contains Office Math content"""
+        return next(element.iter(M_OMATH), None) is not None
+    
+    def _add_document_metadata(self, core_properties: CoreProperties) -> None:
         """Add document metadata to structure"""
         try:
-            if doc.core_properties:
+            if core_properties:
                 metadata = {
-                    'title': doc.core_properties.title,
-                    'author': doc.core_properties.author,
-                    'comments': doc.core_properties.comments,
-                    'category': doc.core_properties.category,
-                    'created': doc.core_properties.created.isoformat() if doc.core_properties.created else None,
-                    'modified': doc.core_properties.modified.isoformat() if doc.core_properties.modified else None,
-                    'last_modified_by': doc.core_properties.last_modified_by,
-                    'revision': doc.core_properties.revision,
-                    'keywords': doc.core_properties.keywords,
-                    'subject': doc.core_properties.subject
+                    'title': core_properties.title,
+                    'author': core_properties.author,
+                    'comments': core_properties.comments,
+                    'category': core_properties.category,
+                    'created': core_properties.created.isoformat() if core_properties.created else None,
+                    'modified': core_properties.modified.isoformat() if core_properties.modified else None,
+                    'last_modified_by': core_properties.last_modified_by,
+                    'revision': core_properties.revision,
+                    'keywords': core_properties.keywords,
+                    'subject': core_properties.subject
                 }
                 
                 # Filter out None values
@@ -123,19 +382,27 @@ class DocxConverter(BaseDocumentConverter):
     
     def _process_paragraph(self, paragraph: Paragraph) -> None:
         """Process paragraph with style preservation"""
-        if not paragraph.text.strip():
+        # Cheap check for spacer paragraphs before materializing any text
+        if next(paragraph._element.iter(W_T), None) is None:
+            return
+        
+        # Paragraph.text runs an XPath over the runs; read it once
+        raw_text = paragraph.text
+        text = raw_text.strip()
+        if not text:
             return
             
         # Get paragraph style
-        style_name = paragraph.style.name if paragraph.style else 'Normal'
+        style_name = self._style_name(paragraph)
         
         # Check for headings
         if style_name.startswith('Heading'):
             try:
                 level = int(style_name[-1])
+                self._close_current_list()
                 self.structure.add_element(DocumentElement(
                     type=ElementType.HEADING,
-                    content=paragraph.text,
+                    content=raw_text,
                     level=level,
                     metadata=self._get_paragraph_style_info(paragraph)
                 ))
@@ -144,81 +411,102 @@ class DocxConverter(BaseDocumentConverter):
                 pass
         
         # Check for lists
-        list_info = self._get_list_info(paragraph)
+        list_info = self._get_list_info(paragraph, text)
         if list_info:
-            self._handle_list_item(paragraph, list_info)
+            self._handle_list_item(text, list_info)
             return
         
         # Handle regular paragraph
         self._handle_regular_paragraph(paragraph)
     
-    def _get_paragraph_style_info(self, paragraph: Paragraph) -> Dict[str, Any]:
-        """Extract detailed paragraph style information"""
-        style_info = {
-            'name': paragraph.style.name if paragraph.style else 'Normal',
-            'alignment': str(paragraph.alignment) if hasattr(paragraph, 'alignment') else None,
-            'indentation': {},
-            'spacing': {},
-            'font': {}
+    def _get_paragraph_style_info(self, paragraph: Paragraph) -> Mapping[str, Any]:
+        """Return paragraph style information, extracted lazily on first access"""
+        style_info = _LazyStyleInfo(self, paragraph)
+        if self._eager_style_info:
+            return dict(style_info)
+        return style_info
+    
+    def _style_name(self, paragraph: Paragraph) -> str:
+        # Resolve w:pStyle through the prebuilt styleId map rather than
+        # python-docx's style registry
+        names, default_name = self._style_names
+        pPr = paragraph._element.pPr
+        style_id = pPr.style if pPr is not None else None
+        return names.get(style_id, default_name) if style_id else default_name
+    
+    def _style_alignment(self, paragraph: Paragraph) -> Optional[str]:
+        return str(paragraph.alignment) if hasattr(paragraph, 'alignment') else None
+    
+    def _style_indentation(self, paragraph: Paragraph) -> Dict[str, Any]:
+        # Lengths are stored as raw EMU integers
+        pPr = paragraph._element.pPr
+        if pPr is None or pPr.ind is None:
+            return {}
+        ind = pPr.ind
+        return {
+            'left': int(ind.left) if ind.left else None,
+            'right': int(ind.right) if ind.right else None,
+            'first_line': int(ind.firstLine) if ind.firstLine else None,
         }
+    
+    def _style_spacing(self, paragraph: Paragraph) -> Dict[str, Any]:
+        pPr = paragraph._element.pPr
+        if pPr is None or pPr.spacing is None:
+            return {}
+        spacing = pPr.spacing
+        return {
+            'before': int(spacing.before) if spacing.before else None,
+            'after': int(spacing.after) if spacing.after else None,
+            'line': int(spacing.line) if spacing.line else None,
+        }
+    
+    def _style_font(self, paragraph: Paragraph) -> Dict[str, Any]:
+        # Read run properties of the first run (font info) straight off lxml
+        r = paragraph._element.find(W_R)
+        if r is None:
+            return {}
+        rPr = r.find(W_RPR)
+        if rPr is None:
+            return dict.fromkeys(('name', 'size', 'bold', 'italic', 'underline', 'color'))
         
-        try:
-            if paragraph._element.pPr is not None:
-                # Get indentation
-                if paragraph._element.pPr.ind is not None:
-                    ind = paragraph._element.pPr.ind
-                    style_info['indentation'].update({
-                        'left': ind.left.__str__() if ind.left else None,
-                        'right': ind.right.__str__() if ind.right else None,
-                        'first_line': ind.firstLine.__str__() if ind.firstLine else None,
-                    })
-                
-                # Get spacing
-                if paragraph._element.pPr.spacing is not None:
-                    spacing = paragraph._element.pPr.spacing
-                    style_info['spacing'].update({
-                        'before': spacing.before.__str__() if spacing.before else None,
-                        'after': spacing.after.__str__() if spacing.after else None,
-                        'line': spacing.line.__str__() if spacing.line else None,
-                    })
-                
-            # Get run properties for first run (font info)
-            if paragraph.runs:
-                run = paragraph.runs[0]
-                font = run.font
-                style_info['font'].update({
-                    'name': font.name,
-                    'size': str(font.size) if font.size else None,
-                    'bold': font.bold,
-                    'italic': font.italic,
-                    'underline': font.underline,
-                    'color': str(font.color.rgb) if font.color and font.color.rgb else None
-                })
-        
-        except Exception as e:
-            self.log_warning(f"Error extracting paragraph style: {str(e)}")
-        
-        return style_info
+        fonts = rPr.find(W_RFONTS)
+        sz = rPr.find(W_SZ)
+        u = rPr.find(W_U)
+        color = rPr.find(W_COLOR)
+        b = rPr.find(W_B)
+        i = rPr.find(W_I)
+        return {
+            'name': fonts.get(W_ASCII) if fonts is not None else None,
+            # w:sz is in half-points; store EMU like docx.shared.Length
+            'size': int(sz.get(W_VAL)) * 6350 if sz is not None else None,
+            'bold': self._is_toggle_on(b) if b is not None else None,
+            'italic': self._is_toggle_on(i) if i is not None else None,
+            'underline': u.get(W_VAL) if u is not None else None,
+            'color': color.get(W_VAL) if color is not None else None
+        }
     
-    def _get_list_info(self, paragraph: Paragraph) -> Optional[Dict[str, Any]]:
+    def _get_list_info(self, paragraph: Paragraph, text: str) -> Optional[Dict[str, Any]]:
         """Extract list information from paragraph"""
         try:
-            if paragraph._element.pPr is None:
+            pPr = paragraph._element.pPr
+            if pPr is None:
                 return None
                 
-            num_pr = paragraph._element.pPr.xpath('./w:numPr')
-            if not num_pr:
+            num_pr = pPr.find(W_NUMPR)
+            if num_pr is None:
                 return None
                 
-            num_pr = num_pr[0]
-            ilvl = num_pr.xpath('./w:ilvl/@w:val')
-            numId = num_pr.xpath('./w:numId/@w:val')
+            ilvl_el = num_pr.find(W_ILVL)
+            num_id_el = num_pr.find(W_NUMID)
+            ilvl = ilvl_el.get(W_VAL) if ilvl_el is not None else None
+            numId = num_id_el.get(W_VAL) if num_id_el is not None else None
             
             if ilvl and numId:
+                level = int(ilvl)
                 return {
-                    'level': int(ilvl[0]),
-                    'list_id': numId[0],
-                    'is_ordered': self._is_ordered_list(paragraph)
+                    'level': level,
+                    'list_id': numId,
+                    'is_ordered': self._is_ordered_list(text, numId, level)
                 }
                 
         except Exception as e:
@@ -226,88 +514,118 @@ class DocxConverter(BaseDocumentConverter):
         
         return None
     
-    def _is_ordered_list(self, paragraph: Paragraph) -> bool:
-        """Determine if paragraph is part of an ordered list"""
+    def _build_numbering_formats(self, numbering) -> Dict[str, Dict[int, bool]]:
+        """Resolve numId -> {ilvl: is_ordered} from the numbering part once per document"""
+        formats: Dict[str, Dict[int, bool]] = {}
         try:
-            # Check numbering properties
-            if paragraph._element.pPr is not None:
-                num_pr = paragraph._element.pPr.xpath('./w:numPr')
-                if num_pr:
-                    num_id = num_pr[0].xpath('./w:numId/@w:val')
-                    if num_id:
-                        # Could extend this to check actual numbering definition
-                        # For now, assume basic heuristic
-                        text = paragraph.text.strip()
-                        return bool(re.match(r'^\d+\.?\s', text))
-        except Exception:
-            pass
-        return False
+            # Ordered-ness of each level of every abstract numbering definition
+            abstract_formats = {}
+            for abstract in numbering.iterchildren(W_ABSTRACTNUM):
+                levels = {}
+                for lvl in abstract.iterchildren(W_LVL):
+                    num_fmt = lvl.find(W_NUMFMT)
+                    fmt = num_fmt.get(W_VAL) if num_fmt is not None else 'decimal'
+                    levels[int(lvl.get(W_ILVL, 0))] = fmt not in _UNORDERED_NUM_FORMATS
+                abstract_formats[abstract.get(W_ABSTRACTNUMID)] = levels
+            
+            # Concrete numbering instances referenced by paragraphs
+            for num in numbering.iterchildren(W_NUM):
+                abstract_ref = num.find(W_ABSTRACTNUMID)
+                if abstract_ref is None:
+                    continue
+                levels = abstract_formats.get(abstract_ref.get(W_VAL))
+                if levels is not None:
+                    formats[num.get(W_NUMID)] = levels
+                    
+        except Exception as e:
+            self.log_warning(f"Error reading numbering definitions: {str(e)}")
+        
+        return formats
+    
+    def _is_ordered_list(self, text: str, num_id: str, level: int) -> bool:
+        """Determine if paragraph is part of an ordered list"""
+        levels = self._numbering_formats.get(num_id)
+        if levels is not None and level in levels:
+            return levels[level]
+        
+        # No numbering definition available: decide from the first item's text
+        # and reuse that answer for the rest of the list
+        cache_key = (num_id, level)
+        if cache_key not in self._ordered_cache:
+            self._ordered_cache[cache_key] = bool(_ORDERED_ITEM_RE.match(text))
+        return self._ordered_cache[cache_key]
     
-    def _handle_list_item(self, paragraph: Paragraph, list_info: Dict[str, Any]) -> None:
+    def _handle_list_item(self, text: str, list_info: Dict[str, Any]) -> None:
         """Handle list item paragraph"""
         list_id = list_info['list_id']
         level = list_info['level']
-        is_ordered = list_info['is_ordered']
         
         # Handle list state changes
         if self._current_list_id != list_id:
             # Close any open lists
             self._close_current_list()
             self._current_list_id = list_id
-            self._list_stack = []
         
-        # Adjust list stack for current level
-        while self._list_stack and self._list_stack[-1]['level'] >= level:
+        # Return to the list owning the current level
+        while self._list_stack and self._list_stack[-1][0] > level:
             self._list_stack.pop()
         
-        # Create new list if needed
-        if not self._list_stack or self._list_stack[-1]['level'] < level:
-            self._list_stack.append({
-                'level': level,
-                'ordered': is_ordered,
-                'items': []
-            })
+        # Open a nested list (or a new top-level list) if needed
+        if not self._list_stack or self._list_stack[-1][0] < level:
+            sublist = DocumentElement(
+                type=ElementType.LIST,
+                content=[],
+                metadata={
+                    'ordered': list_info['is_ordered'],
+                    'level': level
+                }
+            )
+            if self._list_stack:
+                self._list_stack[-1][1].content.append(sublist)
+            else:
+                self._list_roots.append(sublist)
+            self._list_stack.append((level, sublist))
         
         # Add item to current list
-        self._list_stack[-1]['items'].append(paragraph.text.strip())
+        self._list_stack[-1][1].content.append(text)
     
     def _close_current_list(self) -> None:
-        """Close current list and add to structure"""
-        if self._list_stack:
-            for list_info in self._list_stack:
-                self.structure.add_element(DocumentElement(
-                    type=ElementType.LIST,
-                    content=list_info['items'],
-                    metadata={
-                        'ordered': list_info['ordered'],
-                        'level': list_info['level']
-                    }
-                ))
+        """Close current list and add it to structure as a single nested element"""
+        if self._list_roots:
+            for root in self._list_roots:
+                self.structure.add_element(root)
             
-            self._list_stack = []
-            self._current_list_id = None
+            self._list_roots = []
+        self._list_stack = []
+        self._current_list_id = None
     
     def _handle_regular_paragraph(self, paragraph: Paragraph) -> None:
         """Handle regular paragraph content"""
         # Close any open lists
         self._close_current_list()
         
-        # Process runs to preserve inline formatting
+        # Process runs to preserve inline formatting, emitting markdown
+        # delimiters as separate tokens so the paragraph is joined once
         formatted_content = []
-        for run in paragraph.runs:
-            text = run.text
+        append = formatted_content.append
+        for text, bold, italic, underline in self._fast_runs(paragraph._element):
             if not text.strip():
                 continue
                 
-            # Apply inline formatting
-            if run.bold:
-                text = f"**{text}**"
-            if run.italic:
-                text = f"*{text}*"
-            if run.underline:
-                text = f"__{text}__"
-                
-            formatted_content.append(text)
+            # Apply inline formatting (underline outermost, bold innermost)
+            if underline:
+                append('__')
+            if italic:
+                append('*')
+            if bold:
+                append('**')
+            append(text)
+            if bold:
+                append('**')
+            if italic:
+                append('*')
+            if underline:
+                append('__')
         
         if formatted_content:
             self.structure.add_element(DocumentElement(
@@ -316,17 +634,79 @@ class DocxConverter(BaseDocumentConverter):
                 metadata=self._get_paragraph_style_info(paragraph)
             ))
     
+    @staticmethod
+    def _is_toggle_on(prop) -> bool:
+        """Resolve a w:b/w:i style toggle property element to its boolean value"""
+        if prop is None:
+            return False
+        return prop.get(W_VAL) not in ('0', 'false', 'off')
+    
+    def _fast_runs(self, p_elem) -> List[Tuple[str, bool, bool, bool]]:
+        """Read text and inline formatting of a paragraph's runs in one lxml walk"""
+        runs = []
+        for r in p_elem.iterchildren(W_R):
+            text = self._run_text(r)
+            rPr = r.find(W_RPR)
+            if rPr is None:
+                runs.append((text, False, False, False))
+                continue
+            
+            u = rPr.find(W_U)
+            runs.append((
+                text,
+                self._is_toggle_on(rPr.find(W_B)),
+                self._is_toggle_on(rPr.find(W_I)),
+                u is not None and u.get(W_VAL) != 'none'
+            ))
+        return runs
+    
+    @staticmethod
+    def _run_text(r) -> str:
+        """Text of a run with tabs, breaks and hyphens translated like CT_R.text"""
+        parts = []
+        for child in r.iterchildren():
+            tag = child.tag
+            if tag == W_T:
+                parts.append(child.text or '')
+            elif tag == W_BR:
+                # Only line breaks produce text; column and page breaks do not
+                if child.get(W_TYPE, 'textWrapping') == 'textWrapping':
+                    parts.append('\n')
+            else:
+                text = _RUN_CONTENT_TEXT.get(tag)
+                if text is not None:
+                    parts.append(text)
+        return ''.join(parts)
+    
     def _process_table(self, table: Table) -> None:
         """Process table with formatting preservation"""
+        self._close_current_list()
         table_data = []
         
-        for row_idx, row in enumerate(table.rows):
+        # Walk w:tr/w:tc directly; Table.rows and _Row.cells rebuild proxies and
+        # resolve vertical merges with an XPath lookup per merged cell. Cells are
+        # laid out as _Row.cells does: horizontal spans repeat the cell text and
+        # vMerge="continue" cells take the text of the cell above at the same grid
+        # offset, tracked here per row as offset -> (text, span).
+        above = {}
+        for tr in table._tbl.tr_lst:
             row_data = []
-            for cell in row.cells:
-                # Get cell text and clean it
-                cell_text = ' '.join(p.text.strip() for p in cell.paragraphs if p.text.strip())
-                row_data.append(cell_text)
+            current = {}
+            offset = tr.grid_before
+            for tc in tr.tc_lst:
+                span = tc.grid_span
+                if tc.vMerge == ST_Merge.CONTINUE and offset in above:
+                    cell_text, cell_span = above[offset]
+                else:
+                    # Get cell text and clean it
+                    texts = (p.text.strip() for p in tc.iterchildren(W_P))
+                    cell_text = ' '.join(text for text in texts if text)
+                    cell_span = span
+                current[offset] = (cell_text, cell_span)
+                row_data.extend([cell_text] * cell_span)
+                offset += span
             table_data.append(row_data)
+            above = current
         
         if table_data:
             self.structure.add_element(DocumentElement(
@@ -347,40 +727,47 @@ class DocxConverter(BaseDocumentConverter):
         }
         
         try:
-            if table._element.tblPr is not None:
+            tblPr = table._element.tblPr
+            if tblPr is not None:
                 # Get borders
-                borders = table._element.tblPr.xpath('./w:tblBorders')
-                if borders:
-                    for border in borders[0]:
+                borders = tblPr.find(W_TBLBORDERS)
+                if borders is not None:
+                    for border in borders:
                         style_info['borders'][border.tag.split('}')[-1]] = {
-                            'size': border.get(qn('w:sz')),
-                            'color': border.get(qn('w:color')),
-                            'style': border.get(qn('w:val'))
+                            'size': border.get(W_SZ),
+                            'color': border.get(W_COLOR),
+                            'style': border.get(W_VAL)
                         }
                 
                 # Get alignment
-                jc = table._element.tblPr.xpath('./w:jc')
-                if jc:
-                    style_info['alignment'] = jc[0].get(qn('w:val'))
+                jc = tblPr.find(W_JC)
+                if jc is not None:
+                    style_info['alignment'] = jc.get(W_VAL)
                     
         except Exception as e:
             self.log_warning(f"Error getting table style: {str(e)}")
             
         return style_info
     
-    def _process_images(self, doc: Document) -> int:
-        """Process all images in document"""
+    def _collect_image_parts(self, doc: Document) -> Dict[str, Any]:
+        """Map image relationship ids of the main document part to their parts"""
+        image_parts = {}
+        try:
+            for r_id, rel in doc.part.rels.items():
+                if rel.is_external or rel.reltype != RT.IMAGE:
+                    continue
+                image_parts[r_id] = rel.target_part
+        except Exception as e:
+            self.log_warning(f"Error collecting image parts: {str(e)}")
+        return image_parts
+    
+    def _process_images(self, element) -> int:
+        """Process all images referenced from within an element"""
         image_count = 0
         
         try:
-            # Process inline shapes
-            for shape in doc.inline_shapes:
-                if self._process_inline_shape(shape):
-                    image_count += 1
-            
-            # Process shapes
-            for shape in doc.element.body.xpath('//w:drawing'):
-                if self._process_shape(shape):
+            for drawing in element.iter(W_DRAWING):
+                if self._process_drawing(drawing):
                     image_count += 1
                     
         except Exception as e:
@@ -388,109 +775,80 @@ class DocxConverter(BaseDocumentConverter):
             
         return image_count
     
-    def _process_inline_shape(self, shape) -> bool:
-        """Process inline shape"""
+    def _process_drawing(self, drawing) -> bool:
+        """Process a w:drawing element referencing an embedded image"""
         try:
-            if shape.type == 3:  # Picture
-                image_part = shape._inline.graphic.graphicData.pic.blipFill.blip.embed
-                image_data = shape.part.related_parts[image_part].image.blob
-                
-                if image_data and self.file_utils.is_valid_image(image_data):
-                    self._image_counter += 1
-                    encoded_image = self.file_utils.encode_image(image_data)
-                    
-                    if encoded_image:
-                        self.structure.add_element(DocumentElement(
-                            type=ElementType.IMAGE,
-                            content=encoded_image,
-                            metadata={
-                                'width': shape.width,
-                                'height': shape.height,
-                                'image_number': self._image_counter,
-                                'alt_text': self._get_shape_alt_text(shape)
-                            }
-                        ))
-                        return True
+            blip = next(drawing.iter(A_BLIP), None)
+            if blip is None:
+                return False
+            
+            r_id = blip.get(R_EMBED)
+            image_part = self._image_parts.get(r_id)
+            if image_part is None:
+                self.log_warning(f"Image relationship {r_id} not found")
+                return False
+            
+            encoded_image = self._encode_image_part(r_id, image_part)
+            if not encoded_image:
+                return False
+            
+            self._image_counter += 1
+            # Keep images in document order relative to open lists
+            self._close_current_list()
+            
+            # Get shape dimensions
+            extent = next(drawing.iter(WP_EXTENT), None)
+            width = int(extent.get('cx')) if extent is not None else None
+            height = int(extent.get('cy')) if extent is not None else None
+            
+            self.structure.add_element(DocumentElement(
+                type=ElementType.IMAGE,
+                content=encoded_image,
+                metadata={
+                    'width': width,
+                    'height': height,
+                    'image_number': self._image_counter,
+                    'alt_text': self._get_shape_alt_text(drawing)
+                }
+            ))
+            return True
+            
         except Exception as e:
-            self.log_warning(f"Error processing inline shape: {str(e)}")
+            self.log_warning(f"Error processing drawing: {str(e)}")
         return False
 
-    def _process_shape(self, shape) -> bool:
-        """Process regular shape"""
-        try:
-            # Extract image data from shape
-            inline = shape.xpath('.//wp:inline', namespaces={'wp': 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing'})
-            if inline:
-                blip = shape.xpath('.//a:blip/@r:embed', namespaces={
-                    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
-                    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
-                })
-                
-                if blip:
-                    image_part = blip[0]
-                    try:
-                        # Get image data from relationship
-                        image_part = shape.getparent().part.related_parts[image_part]
-                        image_data = image_part.blob
-                        
-                        if image_data and self.file_utils.is_valid_image(image_data):
-                            self._image_counter += 1
-                            encoded_image = self.file_utils.encode_image(image_data)
-                            
-                            if encoded_image:
-                                # Get shape dimensions
-                                extent = inline[0].xpath('.//wp:extent', namespaces={'wp': 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing'})
-                                width = int(extent[0].get('cx')) if extent else None
-                                height = int(extent[0].get('cy')) if extent else None
-                                
-                                self.structure.add_element(DocumentElement(
-                                    type=ElementType.IMAGE,
-                                    content=encoded_image,
-                                    metadata={
-                                        'width': width,
-                                        'height': height,
-                                        'image_number': self._image_counter,
-                                        'alt_text': self._get_shape_alt_text(shape)
-                                    }
-                                ))
-                                return True
-                    except KeyError:
-                        self.log_warning(f"Image relationship {image_part} not found")
-        except Exception as e:
-            self.log_warning(f"Error processing shape: {str(e)}")
-        return False
+    def _encode_image_part(self, r_id: str, image_part: Any) -> Optional[str]:
+        """Validate and encode an image part, reusing results for repeated references"""
+        cache_key = (str(image_part.partname), r_id)
+        if cache_key in self._image_b64_cache:
+            return self._image_b64_cache[cache_key]
+        
+        encoded_image = None
+        image_data = image_part.blob
+        if image_data and self.file_utils.is_valid_image(image_data):
+            encoded_image = self.file_utils.encode_image(image_data)
+        
+        self._image_b64_cache[cache_key] = encoded_image
+        return encoded_image
 
-    def _get_shape_alt_text(self, shape) -> str:
-        """Extract alternative text from shape"""
+    def _get_shape_alt_text(self, drawing) -> str:
+        """Extract alternative text from drawing"""
         try:
-            # Try to get alt text from different possible locations
             alt_text = None
             
-            # For inline shapes
-            if hasattr(shape, 'inline'):
-                docPr = shape.inline.docPr
-                if docPr is not None:
-                    alt_text = docPr.get('descr') or docPr.get('title')
+            # Try wp:docPr
+            doc_pr = next(drawing.iter(WP_DOCPR), None)
+            if doc_pr is not None:
+                alt_text = doc_pr.get('descr') or doc_pr.get('title')
             
-            # For regular shapes
-            elif hasattr(shape, 'xpath'):
-                # Try docPr
-                doc_pr = shape.xpath('.//wp:docPr', namespaces={'wp': 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing'})
-                if doc_pr:
-                    alt_text = doc_pr[0].get('descr') or doc_pr[0].get('title')
-                
-                # Try pic:cNvPr
-                if not alt_text:
-                    cnv_pr = shape.xpath('.//pic:cNvPr', namespaces={'pic': 'http://schemas.openxmlformats.org/drawingml/2006/picture'})
-                    if cnv_pr:
-                        alt_text = cnv_pr[0].get('descr') or cnv_pr[0].get('title')
+            # Try pic:cNvPr
+            if not alt_text:
+                cnv_pr = next(drawing.iter(PIC_CNVPR), None)
+                if cnv_pr is not None:
+                    alt_text = cnv_pr.get('descr') or cnv_pr.get('title')
             
             return alt_text or f"Image {self._image_counter}"
             
         except Exception as e:
             self.log_warning(f"Error getting shape alt text: {str(e)}")
             return f"Image {self._image_counter}"
-
-    def __del__(self):
-        """Cleanup temporary files on object destruction"""
-        self.file_utils.cleanup_temp_files(self._temp_files)
\ No newline at end of file
@@ -1,61 +1,117 @@
+import os
+import asyncio
 import PyPDF2
+import fitz
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, Any, List, Tuple, Optional, Set
 import re
 from io import BytesIO
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from loguru import logger
 from ..base_converter import BaseDocumentConverter, ConversionContext
-from ..document_structure import DocumentStructure, DocumentElement, ElementType
+from ..document_structure import DocumentStructure, DocumentElement, ElementType, ElementBuffer
 from ..file_utils import FileUtils
 from models.file_conversion_models import FileMetadata, FileType
 
+# Extracted text element type tags
+_T_HEADING = 0
+_T_LIST = 1
+_T_PARA = 2
+
+# Paragraph classification character classes
+_UPPERCASE = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+_LOWERCASE = frozenset('abcdefghijklmnopqrstuvwxyz')
+_BULLETS = frozenset('-*•–—')
+_CHECKBOX_MARKS = frozenset('xX \t\n\r\f\v')
+_SENTENCE_END = frozenset('.?!')
+_HEADING_KEYWORDS = ('Chapter', 'Section', 'Part')
+
+def _skip_digits(text: str, pos: int) -> int:
+    """Index of the first non-digit character at or after pos"""
+    n = len(text)
+    while pos < n and text[pos].isdecimal():
+        pos += 1
+    return pos
+
+def _starts_with_numbered(text: str, keywords: Tuple[str, ...]) -> bool:
+    """Check for '<keyword><whitespace><digit>' at the start of text"""
+    for keyword in keywords:
+        if text.startswith(keyword):
+            rest = text[len(keyword):]
+            stripped = rest.lstrip()
+            if len(stripped) < len(rest) and stripped[:1].isdecimal():
+                return True
+    return False
+
+# List marker handling
+_RE_LIST_NUMBERED = re.compile(r'^\s*\d+[\.\)]\s')  # Numbered items
+_RE_ORDERED_MARKER = re.compile(r'^\s*\d+[\.\)]\s*')
+_RE_UNORDERED_MARKER = re.compile(r'^\s*(?:[\-\*•]|\[[xX\s]\]|[-–—])\s*')
+
+# PyMuPDF metadata keys -> PDF Info dictionary entry names
+_FITZ_INFO_KEYS = {
+    'title': 'Title',
+    'author': 'Author',
+    'subject': 'Subject',
+    'keywords': 'Keywords',
+    'creator': 'Creator',
+    'producer': 'Producer',
+    'creationDate': 'CreationDate',
+    'modDate': 'ModDate',
+    'trapped': 'Trapped',
+}
+
+# PyMuPDF image extensions that can be re-saved as-is; anything else is converted to PNG
+_IMAGE_FORMATS = {'jpeg': 'JPEG', 'jpg': 'JPEG', 'png': 'PNG'}
+
+# Table detection
+# Fallback pattern for text tables with ASCII grid lines
+_RE_TEXT_TABLE = re.compile(r'[\|\+][-\+]+[\|\+][\s\S]+?[\|\+][-\+]+[\|\+]')
+_RE_CELL_GAP = re.compile(r'\s{2,}')
+
 class PDFConverter(BaseDocumentConverter):
     """Enhanced PDF to Markdown converter with semantic structure preservation"""
     
+    # Documents with at least this many pages are processed in a process pool
+    PARALLEL_MIN_PAGES = 8
+    PLAIN_TEXT_PROBE_BLOCKS = 20
+    MAX_PAGE_WORKERS = min(os.cpu_count() or 1, 8)
+    
     def __init__(self):
         super().__init__()
         self.structure = DocumentStructure()
         self.file_utils = FileUtils()
-        self._temp_files = []
         self._image_counter = 0
         self._current_page = 0
+        self._encoded_images: Dict[int, Tuple[Optional[str], Optional[str]]] = {}
         
     async def convert(self, content: bytes, context: ConversionContext) -> Tuple[str, FileMetadata]:
-        """Convert PDF file to markdown"""
+        """Convert PDF file to markdown.
+        
+        The converter takes over the caller's reference to content and drops it
+        once the pages are processed, before the markdown is assembled.
+        """
         self.context = context
-        temp_path = None
-        images_found = []
-        tables_found = []
         
         try:
-            # Create temporary file
-            temp_path = self.file_utils.create_temp_file(content, '.pdf')
-            self._temp_files.append(temp_path)
-            
-            # Open PDF file
-            with open(temp_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                
+            # Open PDF file with PyMuPDF; PyPDF2 is only a metadata fallback
+            doc = fitz.open(stream=content, filetype="pdf")
+            try:
                 # Add document metadata
-                self._add_document_metadata(reader)
+                self._add_document_metadata(doc, content)
                 
-                # Process each page
-                for page_num, page in enumerate(reader.pages, 1):
-                    self._current_page = page_num
-                    
-                    # Add page marker
-                    self._add_page_marker(page_num)
-                    
-                    # Extract and process content
-                    extracted_images = self._extract_images(page)
-                    images_found.extend(extracted_images)
-                    
-                    extracted_tables = self._extract_tables(page)
-                    tables_found.extend(extracted_tables)
-                    
-                    # Extract and process text content
-                    text_content = self._extract_text_with_formatting(page)
-                    self._process_text_content(text_content)
+                # Process pages, fanning out to worker processes for long documents
+                page_count = doc.page_count
+                if page_count >= self.PARALLEL_MIN_PAGES and self.MAX_PAGE_WORKERS > 1:
+                    images_count, tables_count = await self._process_pages_parallel(content, page_count)
+                else:
+                    images_count, tables_count = self._process_pages(doc, 1, page_count + 1)
+            finally:
+                doc.close()
+            
+            # PyMuPDF reads from the buffer without copying it, so it is only
+            # released here, after the document is closed
+            del content
             
             # Convert to markdown
             markdown_content = self.structure.to_markdown()
@@ -65,9 +121,9 @@ class PDFConverter(BaseDocumentConverter):
                 filename=context.filename,
                 size_bytes=context.size_bytes,
                 file_type=FileType.PDF,
-                pages=len(reader.pages),
-                images_count=len(images_found),
-                tables_count=len(tables_found),
+                pages=page_count,
+                images_count=images_count,
+                tables_count=tables_count,
                 equations_count=None  # PDF doesn't reliably expose equation data
             )
             
@@ -76,29 +132,71 @@ class PDFConverter(BaseDocumentConverter):
         except Exception as e:
             logger.error(f"PDF conversion error: {str(e)}")
             raise
-        finally:
-            # Cleanup temporary files
-            self.file_utils.cleanup_temp_files(self._temp_files)
     
-    def _add_document_metadata(self, reader: PyPDF2.PdfReader) -> None:
+    def _process_pages(self, doc: fitz.Document, start: int, end: int) -> Tuple[int, int]:
+        """Process pages [start, end) into the structure, returning (images, tables) counts"""
+        images_count = 0
+        tables_count = 0
+        
+        for page_num in range(start, end):
+            self._current_page = page_num
+            
+            # Add page marker
+            self._add_page_marker(page_num)
+            
+            # Extract and process content
+            fitz_page = doc[page_num - 1]
+            images_count += len(self._extract_images(doc, fitz_page))
+            tables_count += len(self._extract_tables(fitz_page))
+            
+            # Extract and process text content
+            self._process_text_content(*self._extract_text_with_formatting(fitz_page))
+        
+        return images_count, tables_count
+    
+    async def _process_pages_parallel(self, content: bytes, page_count: int) -> Tuple[int, int]:
+        """Process page ranges in a process pool and merge results in page order"""
+        workers = min(self.MAX_PAGE_WORKERS, page_count)
+        size = -(-page_count // workers)
+        ranges = [(start, min(start + size, page_count + 1))
+                  for start in range(1, page_count + 1, size)]
+        
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(executor, _process_page_range, content, start, end)
+                for start, end in ranges
+            ))
+        
+        images_count = 0
+        tables_count = 0
+        # Each range encodes its own copy of images repeated across ranges
+        # (logos, backgrounds); keep a single data URI per distinct image
+        encoded_images: Dict[str, str] = {}
+        for elements, images, tables, warnings in results:
+            for element in elements:
+                if element.type == ElementType.IMAGE:
+                    # Replace range-local numbering with document-wide numbering
+                    self._image_counter += 1
+                    element.metadata['image_number'] = self._image_counter
+                    element.content = encoded_images.setdefault(element.content, element.content)
+                self.structure.add_element(element)
+            images_count += images
+            tables_count += tables
+            self.context.warnings.extend(warnings)
+        
+        return images_count, tables_count
+    
+    def _add_document_metadata(self, doc: fitz.Document, content: bytes) -> None:
         """Add PDF document metadata to structure"""
         try:
-            if reader.metadata:
-                # Clean and format metadata
-                metadata = {
-                    key.strip('/'): value 
-                    for key, value in reader.metadata.items()
-                    if value and isinstance(value, (str, int, float, bool))
-                }
-                
+            metadata = self._read_document_info(doc, content)
+            if metadata:
                 # Convert dates if present
                 for key in ['CreationDate', 'ModDate']:
                     if key in metadata:
                         try:
-                            # Handle PDF date format like "D:20220101120000+00'00'"
-                            date_str = metadata[key].strip('D:').split('+')[0]
-                            date = datetime.strptime(date_str, '%Y%m%d%H%M%S')
-                            metadata[key] = date.isoformat()
+                            metadata[key] = self._parse_pdf_date(metadata[key]).isoformat()
                         except (ValueError, AttributeError):
                             pass
                 
@@ -111,6 +209,42 @@ class PDFConverter(BaseDocumentConverter):
         except Exception as e:
             self.log_warning(f"Error extracting PDF metadata: {str(e)}")
     
+    def _read_document_info(self, doc: fitz.Document, content: bytes) -> Dict[str, Any]:
+        """Read the document Info dictionary, keyed by PDF Info entry names"""
+        info = doc.metadata
+        if info:
+            return {name: info[key] for key, name in _FITZ_INFO_KEYS.items() if info.get(key)}
+        
+        # PyMuPDF reports no metadata (e.g. for some encrypted files); try PyPDF2
+        reader = PyPDF2.PdfReader(BytesIO(content))
+        if not reader.metadata:
+            return {}
+        return {
+            key.strip('/'): value 
+            for key, value in reader.metadata.items()
+            if value and isinstance(value, (str, int, float, bool))
+        }
+    
+    def _parse_pdf_date(self, value: str) -> datetime:
+        """Parse a PDF date like "D:20220101120000+05'30'" by slicing its fixed fields"""
+        if value.startswith('D:'):
+            value = value[2:]
+        
+        # Everything after the year is optional
+        date = datetime(
+            int(value[0:4]), int(value[4:6] or 1), int(value[6:8] or 1),
+            int(value[8:10] or 0), int(value[10:12] or 0), int(value[12:14] or 0)
+        )
+        
+        sign = value[14:15]
+        if sign == 'Z':
+            return date.replace(tzinfo=timezone.utc)
+        if sign in ('+', '-'):
+            offset = value[15:].replace("'", '')
+            delta = timedelta(hours=int(offset[0:2] or 0), minutes=int(offset[2:4] or 0))
+            return date.replace(tzinfo=timezone(delta if sign == '+' else -delta))
+        return date
+    
     def _add_page_marker(self, page_num: int) -> None:
         """Add page marker to document structure"""
         self.structure.add_element(DocumentElement(
@@ -120,116 +254,83 @@ class PDFConverter(BaseDocumentConverter):
             level=2
         ))
     
-    def _extract_images(self, page: Any) -> List[Dict[str, Any]]:
+    def _extract_images(self, doc: fitz.Document, page: fitz.Page) -> List[Dict[str, Any]]:
         """Extract images from PDF page"""
         images = []
         try:
-            if '/XObject' in page:
-                xObject = page['/XObject'].get_object()
-                
-                for obj in xObject:
-                    if xObject[obj]['/Subtype'] == '/Image':
-                        image = xObject[obj]
-                        try:
-                            image_data = self._extract_image_data(image)
-                            if image_data:
-                                self._image_counter += 1
-                                
-                                # Get image format
-                                format = self._determine_image_format(image)
-                                
-                                # Encode image
-                                encoded_image = self.file_utils.encode_image(
-                                    image_data, 
-                                    format=format
-                                )
-                                
-                                if encoded_image:
-                                    # Add image to structure
-                                    self.structure.add_element(DocumentElement(
-                                        type=ElementType.IMAGE,
-                                        content=encoded_image,
-                                        metadata={
-                                            'page': self._current_page,
-                                            'image_number': self._image_counter,
-                                            'width': image.get('/Width'),
-                                            'height': image.get('/Height'),
-                                            'bits': image.get('/BitsPerComponent'),
-                                            'color_space': str(image.get('/ColorSpace')),
-                                            'format': format
-                                        }
-                                    ))
-                                    
-                                    images.append({
-                                        'format': format,
-                                        'width': image.get('/Width'),
-                                        'height': image.get('/Height')
-                                    })
-                                    
-                        except Exception as e:
-                            self.log_warning(f"Error extracting image: {str(e)}")
-                            
+            for xref, _smask, width, height, bits, color_space, *_ in page.get_images(full=True):
+                try:
+                    # Images drawn on several pages (logos, backgrounds) share an
+                    # xref, so each one is extracted and encoded only once
+                    entry = self._encoded_images.get(xref)
+                    if entry is None:
+                        entry = self._encoded_images[xref] = self._encode_xref_image(doc, xref)
+                    format, encoded_image = entry
+                    if format is None:
+                        continue
+                    
+                    self._image_counter += 1
+                    
+                    if encoded_image:
+                        # Add image to structure
+                        self.structure.add_element(DocumentElement(
+                            type=ElementType.IMAGE,
+                            content=encoded_image,
+                            metadata={
+                                'page': self._current_page,
+                                'image_number': self._image_counter,
+                                'width': width,
+                                'height': height,
+                                'bits': bits,
+                                'color_space': color_space,
+                                'format': format
+                            }
+                        ))
+                        
+                        images.append({
+                            'format': format,
+                            'width': width,
+                            'height': height
+                        })
+                        
+                except Exception as e:
+                    self.log_warning(f"Error extracting image: {str(e)}")
+                    
         except Exception as e:
             self.log_warning(f"Error processing page images: {str(e)}")
             
         return images
     
-    def _extract_image_data(self, image: Any) -> Optional[bytes]:
-        """Extract raw image data based on filter type"""
-        try:
-            filter_type = image['/Filter']
-            
-            if isinstance(filter_type, list):
-                filter_type = filter_type[0]
-            
-            if filter_type == '/FlateDecode':
-                return image.get_data()
-            elif filter_type in ['/DCTDecode', '/JPXDecode']:
-                return image.get_data()
-            elif filter_type == '/CCITTFaxDecode':
-                return image.get_data()
-                
-        except Exception as e:
-            self.log_warning(f"Error extracting image data: {str(e)}")
-        return None
-    
-    def _determine_image_format(self, image: Any) -> str:
-        """Determine image format from PDF image object"""
-        filter_type = image['/Filter']
-        if isinstance(filter_type, list):
-            filter_type = filter_type[0]
-            
-        format_map = {
-            '/DCTDecode': 'JPEG',
-            '/JPXDecode': 'JP2',
-            '/CCITTFaxDecode': 'PNG',
-            '/FlateDecode': 'PNG'
-        }
+    def _encode_xref_image(self, doc: fitz.Document, xref: int) -> Tuple[Optional[str], Optional[str]]:
+        """Extract and encode an image, returning (format, data URI); format is None without image data"""
+        # Returns the stream decoded and framed as a standalone image file
+        info = doc.extract_image(xref)
+        if not info or not info.get("image"):
+            return None, None
         
-        return format_map.get(filter_type, 'PNG')
+        format = _IMAGE_FORMATS.get(info["ext"].lower(), 'PNG')
+        return format, self.file_utils.encode_image(info["image"], format=format)
     
-    def _extract_tables(self, page: Any) -> List[Dict[str, Any]]:
-        """Extract tables from PDF page using positioning analysis"""
+    def _extract_tables(self, page: fitz.Page) -> List[Dict[str, Any]]:
+        """Extract tables from PDF page using ruling-line detection"""
         tables = []
         try:
-            text = page.extract_text()
-            
-            # Use regex patterns to identify potential tables
-            table_patterns = [
-                # Pattern for tables with grid lines (assuming consistent spacing)
-                r'[\|\+][-\+]+[\|\+][\s\S]+?[\|\+][-\+]+[\|\+]',
-                # Pattern for tables with consistent spacing
-                r'(\s{2,}\S+){3,}[\s\S]+?(\s{2,}\S+){3,}'
-            ]
-            
+            # Detect tables from the page's ruling lines
             table_data = []
-            for pattern in table_patterns:
-                matches = re.finditer(pattern, text)
-                for match in matches:
-                    table_text = match.group()
-                    rows = self._parse_table_text(table_text)
-                    if rows and len(rows) > 1:  # At least header and one data row
-                        table_data.append(rows)
+            for table in page.find_tables(strategy="lines"):
+                rows = [['' if cell is None else cell.strip() for cell in row]
+                        for row in table.extract()]
+                if len(rows) > 1:  # At least header and one data row
+                    table_data.append(rows)
+            
+            # Fall back to ASCII grid tables drawn with text characters
+            if not table_data:
+                text = page.get_text()
+                if '|' in text:
+                    for match in _RE_TEXT_TABLE.finditer(text):
+                        rows = self._parse_table_text(match.group())
+                        if len(rows) > 1:
+                            table_data.append(rows)
             
             # Add found tables to structure
             for table_rows in table_data:
@@ -255,194 +356,235 @@ class PDFConverter(BaseDocumentConverter):
     def _parse_table_text(self, table_text: str) -> List[List[str]]:
         """Parse table text into rows and columns"""
         rows = []
-        lines = table_text.split('\n')
+        lines = table_text.splitlines()
         
         for line in lines:
-            # Skip separator lines
-            if re.match(r'^[\|\+][-\+]+[\|\+]$', line):
+            # Skip separator lines like "+---+---+"
+            if (len(line) >= 3 and line[0] in '|+' and line[-1] in '|+'
+                    and not line[1:-1].strip('-+')):
                 continue
                 
             # Split by vertical bars or multiple spaces
             if '|' in line:
-                cells = [cell.strip() for cell in line.split('|')]
-                # Remove empty cells at start/end from vertical bars
-                if not cells[0]:
-                    cells = cells[1:]
-                if not cells[-1]:
-                    cells = cells[:-1]
+                parts = line.split('|')
+                # Leave out empty cells at start/end from vertical bars
+                start = 0 if parts[0].strip() else 1
+                end = len(parts) - (0 if parts[-1].strip() else 1)
+                cells = [parts[i].strip() for i in range(start, end)]
             else:
-                cells = [cell.strip() for cell in re.split(r'\s{2,}', line.strip())]
+                cells = [cell.strip() for cell in _RE_CELL_GAP.split(line.strip())]
             
             if cells:
                 rows.append(cells)
         
         return rows
     
-    def _extract_text_with_formatting(self, page: Any) -> List[Dict[str, Any]]:
-        """Extract text while preserving formatting"""
-        elements = []
+    def _extract_text_with_formatting(self, page: fitz.Page) -> Tuple[List[int], List[str], List[int]]:
+        """Extract text blocks with font information from a PyMuPDF page.
+        
+        Returns parallel lists of element type tags, contents and heading levels.
+        """
+        types: List[int] = []
+        contents: List[str] = []
+        levels: List[int] = []
         try:
-            text = page.extract_text()
-            if not text.strip():
-                return elements
-                
-            # Split into paragraphs
-            paragraphs = text.split('\n\n')
+            text_blocks = []
+            size_weights: Dict[float, int] = {}
             
-            for para in paragraphs:
-                if not para.strip():
-                    continue
-                    
-                # Detect headers
-                if self._is_heading(para):
-                    level = self._determine_heading_level(para)
-                    elements.append({
-                        'type': 'heading',
-                        'content': para.strip(),
-                        'level': level
-                    })
+            # A single C-level call yields blocks -> lines -> spans with font sizes
+            for block in page.get_text("dict")["blocks"]:
+                if block.get("type") != 0:  # Skip image blocks
                     continue
                 
-                # Detect lists
-                if self._is_list_item(para):
-                    elements.append({
-                        'type': 'list_item',
-                        'content': para.strip()
-                    })
-                    continue
+                lines = []
+                max_size = 0.0
+                for line in block["lines"]:
+                    spans = line["spans"]
+                    lines.append(''.join(span["text"] for span in spans))
+                    for span in spans:
+                        size = round(span["size"], 1)
+                        size_weights[size] = size_weights.get(size, 0) + len(span["text"])
+                        if size > max_size:
+                            max_size = size
                 
-                # Regular paragraph
-                elements.append({
-                    'type': 'paragraph',
-                    'content': para.strip()
-                })
+                para = '\n'.join(lines).strip()
+                if para:
+                    text_blocks.append((para, max_size))
+            
+            # The size covering most characters is taken as the body text size
+            body_size = max(size_weights, key=size_weights.get) if size_weights else 0.0
+            
+            # Once a page has shown only plain paragraphs for a while, stop
+            # running the text-pattern classifier on the rest of it
+            classify = self._classify_paragraph
+            pattern_hits = 0
+            for i, (para, size) in enumerate(text_blocks):
+                # Detect headers by font size first, then classify by text patterns
+                level = self._heading_level_from_font(para, size, body_size)
+                if level is not None:
+                    kind = _T_HEADING
+                elif classify is None:
+                    kind, level = _T_PARA, 0
+                else:
+                    kind, level = classify(para)
+                    if kind != _T_PARA:
+                        pattern_hits += 1
+                    elif not pattern_hits and i >= self.PLAIN_TEXT_PROBE_BLOCKS:
+                        classify = None
+                
+                types.append(kind)
+                contents.append(para)
+                levels.append(level)
                 
         except Exception as e:
             self.log_warning(f"Error extracting text: {str(e)}")
             
-        return elements
+        return types, contents, levels
+    
+    def _heading_level_from_font(self, text: str, size: float, body_size: float) -> Optional[int]:
+        """Derive a heading level from a block's font size relative to body text"""
+        if not body_size or size < body_size * 1.15:
+            return None
+        if len(text) > 100 or '\n' in text or text[-1] in _SENTENCE_END:
+            return None
+        
+        ratio = size / body_size
+        if ratio >= 1.6:
+            return 1
+        if ratio >= 1.3:
+            return 2
+        return 3
     
-    def _process_text_content(self, elements: List[Dict[str, Any]]) -> None:
+    def _process_text_content(self, types: List[int], contents: List[str], levels: List[int]) -> None:
         """Process extracted text elements"""
+        elements: List[DocumentElement] = []
+        append = elements.append
         current_list_items = []
         
-        for element in elements:
-            if element['type'] == 'heading':
-                # If there's an ongoing list, flush it
-                if current_list_items:
-                    self._add_list_element(current_list_items)
-                    current_list_items = []
-                
-                self.structure.add_element(DocumentElement(
+        for i, kind in enumerate(types):
+            if kind == _T_LIST:
+                current_list_items.append(contents[i])
+                continue
+            
+            # If there's an ongoing list, flush it
+            if current_list_items:
+                append(self._make_list_element(current_list_items))
+                current_list_items = []
+            
+            if kind == _T_HEADING:
+                append(DocumentElement(
                     type=ElementType.HEADING,
-                    content=element['content'],
-                    level=element['level']
+                    content=contents[i],
+                    level=levels[i]
                 ))
-                
-            elif element['type'] == 'list_item':
-                current_list_items.append(element['content'])
-                
-            elif element['type'] == 'paragraph':
-                # If there's an ongoing list, flush it
-                if current_list_items:
-                    self._add_list_element(current_list_items)
-                    current_list_items = []
-                
-                self.structure.add_element(DocumentElement(
+            else:
+                append(DocumentElement(
                     type=ElementType.PARAGRAPH,
-                    content=element['content']
+                    content=contents[i]
                 ))
         
         # Flush any remaining list items
         if current_list_items:
-            self._add_list_element(current_list_items)
+            append(self._make_list_element(current_list_items))
+        
+        self.structure.extend(elements)
     
-    def _is_heading(self, text: str) -> bool:
-        """Detect if text is likely a heading"""
-        # Heading heuristics:
-        # 1. Short length (typically < 100 chars)
-        # 2. No sentence-ending punctuation
-        # 3. Starts with common heading patterns
-        if len(text) > 100:
-            return False
-            
-        text = text.strip()
+    def _classify_paragraph(self, text: str) -> Tuple[int, int]:
+        """Classify a stripped paragraph as (_T_HEADING, level), (_T_LIST, 0)
+        or (_T_PARA, 0) in a single scan of its prefix.
+        
+        Heading heuristics: short (<= 100 chars), no sentence-ending punctuation
+        and a numbered, hierarchical, all-caps or Chapter/Section/Part prefix.
+        """
         if not text:
-            return False
-            
-        # Check for sentence-ending punctuation
-        if text[-1] in {'.', '?', '!'}:
-            return False
-            
-        # Check for heading patterns
-        heading_patterns = [
-            r'^\d+[\.\)]\s',  # Numbered headings
-            r'^[A-Z][^a-z]+$',  # All caps
-            r'^(?:Chapter|Section|Part)\s+\d+',  # Common heading starts
-            r'^\d+\.\d+\s'  # Hierarchical numbering
-        ]
+            return _T_PARA, 0
         
-        return any(re.match(pattern, text) for pattern in heading_patterns)
-    
-    def _determine_heading_level(self, text: str) -> int:
-        """Determine heading level based on text characteristics"""
-        text = text.strip()
+        first = text[0]
+        headable = len(text) <= 100 and text[-1] not in _SENTENCE_END
         
-        # Check for different heading patterns and assign appropriate levels
-        if re.match(r'^(?:Chapter|Book)\s+\d+', text, re.I):
-            return 1
-        elif re.match(r'^(?:Section|Part)\s+\d+', text, re.I):
-            return 2
-        elif re.match(r'^\d+\.\d+\s', text):
-            return 3
-        elif re.match(r'^\d+[\.\)]\s', text):
-            return 3
-        elif text.isupper():
-            return 2
+        if first.isdecimal():
+            # Walk the leading number: "1. ", "1) " or hierarchical "1.2 "
+            end = _skip_digits(text, 1)
+            marker = text[end:end + 1]
+            if marker in ('.', ')') and text[end + 1:end + 2].isspace():
+                return (_T_HEADING, 3) if headable else (_T_LIST, 0)
+            if headable and marker == '.':
+                sub_end = _skip_digits(text, end + 1)
+                if sub_end > end + 1 and text[sub_end:sub_end + 1].isspace():
+                    return _T_HEADING, 3
+            return _T_PARA, 0
         
-        return 3  # Default level
-    
-    def _is_list_item(self, text: str) -> bool:
-        """Detect if text is a list item"""
-        text = text.strip()
-        if not text:
-            return False
-            
-        list_patterns = [
-            r'^\s*[\-\*•]\s',  # Bullet points
-            r'^\s*\d+[\.\)]\s',  # Numbered items
-            r'^\s*[a-z][\.\)]\s',  # Alphabetical items
-            r'^\s*\[[xX\s]\]',  # Checkbox items
-            r'^\s*[-–—]\s'  # Different types of dashes
-        ]
+        if headable and first in _UPPERCASE:
+            if _starts_with_numbered(text, _HEADING_KEYWORDS):
+                return _T_HEADING, self._keyword_heading_level(text)
+            if len(text) > 1 and not any(c in _LOWERCASE for c in text):
+                # All caps
+                return _T_HEADING, self._keyword_heading_level(text, 2 if text.isupper() else 3)
+        
+        # List markers: bullets/dashes, checkboxes and alphabetical items
+        second = text[1:2]
+        if first in _BULLETS and second.isspace():
+            return _T_LIST, 0
+        if first == '[' and second in _CHECKBOX_MARKS and text[2:3] == ']':
+            return _T_LIST, 0
+        if first in _LOWERCASE and second in ('.', ')') and text[2:3].isspace():
+            return _T_LIST, 0
         
-        return any(re.match(pattern, text) for pattern in list_patterns)
+        return _T_PARA, 0
     
-    def _add_list_element(self, items: List[str]) -> None:
-        """Add list items to document structure"""
-        if not items:
-            return
-            
+    @staticmethod
+    def _keyword_heading_level(text: str, default: int = 3) -> int:
+        """Heading level for keyword-prefixed headings (case-insensitive)"""
+        lowered = text.lower()
+        if _starts_with_numbered(lowered, ('chapter', 'book')):
+            return 1
+        if _starts_with_numbered(lowered, ('section', 'part')):
+            return 2
+        return default
+    
+    def _make_list_element(self, items: List[str]) -> DocumentElement:
+        """Build a list element from raw list item paragraphs"""
         # Determine if list is ordered by checking first item
         first_item = items[0].strip()
-        is_ordered = bool(re.match(r'^\s*\d+[\.\)]\s', first_item))
+        is_ordered = bool(_RE_LIST_NUMBERED.match(first_item))
         
         # Clean list items
         cleaned_items = []
         for item in items:
             # Remove list markers
             if is_ordered:
-                item = re.sub(r'^\s*\d+[\.\)]\s*', '', item)
+                item = _RE_ORDERED_MARKER.sub('', item)
             else:
-                item = re.sub(r'^\s*(?:[\-\*•]|\[[xX\s]\]|[-–—])\s*', '', item)
+                item = item.lstrip()
+                if item[:1] in _BULLETS:
+                    # Single-character bullet or dash, no regex needed
+                    item = item[1:]
+                elif item.startswith('['):
+                    item = _RE_UNORDERED_MARKER.sub('', item)
             cleaned_items.append(item.strip())
         
-        self.structure.add_element(DocumentElement(
+        return DocumentElement(
             type=ElementType.LIST,
             content=cleaned_items,
             metadata={'ordered': is_ordered}
-        ))
+        )
+
+
+def _process_page_range(content: bytes, start: int, end: int) -> Tuple[List[DocumentElement], int, int, List[str]]:
+    """Convert pages [start, end) in a worker process.
+    
+    Page objects cannot be pickled, so each worker reopens the document from
+    the raw bytes. Returns the produced elements, image and table counts, and
+    any warnings raised while processing.
+    """
+    converter = PDFConverter()
+    converter.structure = ElementBuffer()
+    converter.context = ConversionContext(filename='', size_bytes=len(content), source_format='pdf')
+    
+    doc = fitz.open(stream=content, filetype="pdf")
+    try:
+        images, tables = converter._process_pages(doc, start, end)
+    finally:
+        doc.close()
     
-    def __del__(self):
-        """Cleanup temporary files on object destruction"""
-        self.file_utils.cleanup_temp_files(self._temp_files)
\ No newline at end of file
+    return converter.structure.elements, images, tables, converter.context.warnings
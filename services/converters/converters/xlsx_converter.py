@@ -1,47 +1,89 @@
 from typing import Dict, Any, List, Tuple, Optional
 from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.worksheet import Worksheet
 from openpyxl.cell import Cell
-from datetime import datetime
+from datetime import date, datetime, time
+from io import BytesIO
+from xml.etree import ElementTree
+from itertools import chain
+import zipfile
 from ..base_converter import BaseDocumentConverter, ConversionContext
 from ..document_structure import DocumentStructure, DocumentElement, ElementType
 from ..file_utils import FileUtils
 from models.file_conversion_models import FileMetadata, FileType
 from loguru import logger
 
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+# Cell values treated as empty; calamine reports blank cells as ''
+_EMPTY_VALUES = (None, '')
+
+# Core document properties (docProps/core.xml) read for the calamine path
+_CORE_PROPERTIES = {
+    'title': '{http://purl.org/dc/elements/1.1/}title',
+    'subject': '{http://purl.org/dc/elements/1.1/}subject',
+    'creator': '{http://purl.org/dc/elements/1.1/}creator',
+    'created': '{http://purl.org/dc/terms/}created',
+    'modified': '{http://purl.org/dc/terms/}modified',
+}
+
+def _format_w3cdtf(value: Optional[str]) -> Optional[str]:
+    """Re-emit a core.xml timestamp the way openpyxl reports it: naive isoformat()"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return value
+    # openpyxl keeps the wall-clock time and drops the UTC offset
+    return parsed.replace(tzinfo=None).isoformat()
+
+def _format_float(value: float) -> str:
+    """Render integral floats without the trailing .0"""
+    # is_integer() + str(int()) measured faster than modulo/bit tests or f"{v:.0f}"
+    return str(int(value)) if value.is_integer() else str(value)
+
+def _format_date(value: date) -> str:
+    """Render date-only cells as midnight datetimes, as openpyxl reads them"""
+    return datetime.combine(value, time()).isoformat()
+
 class XlsxConverter(BaseDocumentConverter):
     """Enhanced XLSX to Markdown converter"""
     
+    # Cell formatters keyed on the exact value type; anything else uses str()
+    _FORMATTERS = {
+        str: str,
+        int: str,
+        float: _format_float,
+        datetime: datetime.isoformat,
+        date: _format_date,
+    }
+    
     def __init__(self):
         super().__init__()
         self.structure = DocumentStructure()
         self.file_utils = FileUtils()
-        self._temp_files = []
     
     async def convert(self, content: bytes, context: ConversionContext) -> Tuple[str, FileMetadata]:
         """Convert Excel file to markdown"""
         self.context = context
-        temp_path = None
         
         try:
-            # Create temporary file
-            temp_path = self.file_utils.create_temp_file(content, '.xlsx')
-            self._temp_files.append(temp_path)
+            # Prefer the Rust-backed calamine reader; macro-enabled workbooks
+            # and files it cannot read go through openpyxl
+            sheet_count = None
+            if CalamineWorkbook is not None and not context.filename.lower().endswith('.xlsm'):
+                try:
+                    sheet_count, total_tables = self._convert_calamine(content)
+                except Exception as e:
+                    logger.warning(f"Calamine could not read workbook, falling back to openpyxl: {str(e)}")
+                    self.structure = DocumentStructure()
             
-            # Load workbook with data_only=True to get values instead of formulas
-            wb = load_workbook(filename=temp_path, data_only=True, read_only=True)
-            
-            # Add workbook metadata
-            self._add_workbook_metadata(wb)
-            
-            # Process each sheet
-            total_tables = 0
-            for sheet_name in wb.sheetnames:
-                sheet = wb[sheet_name]
-                if self._has_content(sheet):
-                    self._process_sheet(sheet)
-                    total_tables += 1
+            if sheet_count is None:
+                sheet_count, total_tables = self._convert_openpyxl(content)
             
             # Convert to markdown
             markdown_content = self.structure.to_markdown()
@@ -51,7 +93,7 @@ class XlsxConverter(BaseDocumentConverter):
                 filename=context.filename,
                 size_bytes=context.size_bytes,
                 file_type=FileType.XLSX,
-                pages=len(wb.sheetnames),
+                pages=sheet_count,
                 tables_count=total_tables,
                 images_count=0,
                 equations_count=0
@@ -62,24 +104,86 @@ class XlsxConverter(BaseDocumentConverter):
         except Exception as e:
             logger.error(f"XLSX conversion error: {str(e)}")
             raise
+    
+    def _convert_calamine(self, content: bytes) -> Tuple[int, int]:
+        """Process all sheets with calamine, returning (sheets, tables) counts"""
+        wb = CalamineWorkbook.from_filelike(BytesIO(content))
+        try:
+            sheet_names = wb.sheet_names
+            self._add_workbook_metadata(sheet_names, self._read_core_properties(content))
+            
+            total_tables = 0
+            for sheet_name in sheet_names:
+                sheet = self._read_calamine_sheet(wb, sheet_name)
+                if sheet is not None:
+                    self._add_sheet(sheet_name, *sheet)
+                    total_tables += 1
+            
+            return len(sheet_names), total_tables
         finally:
-            # Cleanup temporary files
-            self.file_utils.cleanup_temp_files(self._temp_files)
-            if wb:
-                wb.close()
+            wb.close()
+    
+    def _read_calamine_sheet(self, wb: Any, sheet_name: str) -> Optional[Tuple[List[List[str]], int]]:
+        """Read and format one sheet, or None if its first row is empty"""
+        # Keep leading empty rows/columns so the layout matches openpyxl
+        rows = wb.get_sheet_by_name(sheet_name).to_python(skip_empty_area=False)
+        if not rows or not self._has_content(rows[0]):
+            return None
+        return self._extract_table_data(rows)
     
-    def _add_workbook_metadata(self, wb) -> None:
+    def _convert_openpyxl(self, content: bytes) -> Tuple[int, int]:
+        """Process all sheets with openpyxl, returning (sheets, tables) counts"""
+        # Load workbook from memory with data_only=True to get values instead of
+        # formulas; cached values of external links are never read, so skip them
+        wb = load_workbook(filename=BytesIO(content), data_only=True, read_only=True, keep_links=False)
+        try:
+            self._add_workbook_metadata(wb.sheetnames, self._openpyxl_properties(wb.properties))
+            
+            total_tables = 0
+            for sheet_name in wb.sheetnames:
+                sheet = wb[sheet_name]
+                # In read_only mode, peek at the first row of the same row
+                # stream that is processed, so the sheet XML is parsed once
+                rows = sheet.iter_rows(values_only=True)
+                first_row = next(rows, None)
+                if first_row is not None and self._has_content(first_row):
+                    self._process_sheet(sheet.title, chain((first_row,), rows))
+                    total_tables += 1
+            
+            return len(wb.sheetnames), total_tables
+        finally:
+            wb.close()
+    
+    def _openpyxl_properties(self, props: Any) -> Dict[str, Optional[str]]:
+        """Extract core properties from openpyxl's DocumentProperties"""
+        created = getattr(props, 'created', None)
+        modified = getattr(props, 'modified', None)
+        return {
+            'title': getattr(props, 'title', None),
+            'subject': getattr(props, 'subject', None),
+            'creator': getattr(props, 'creator', None),
+            'created': created.isoformat() if created else None,
+            'modified': modified.isoformat() if modified else None
+        }
+    
+    def _read_core_properties(self, content: bytes) -> Dict[str, Optional[str]]:
+        """Read core document properties straight from the package"""
+        try:
+            with zipfile.ZipFile(BytesIO(content)) as zf:
+                root = ElementTree.fromstring(zf.read('docProps/core.xml'))
+        except (KeyError, zipfile.BadZipFile, ElementTree.ParseError):
+            return dict.fromkeys(_CORE_PROPERTIES)
+        properties = {key: root.findtext(tag) for key, tag in _CORE_PROPERTIES.items()}
+        properties['created'] = _format_w3cdtf(properties['created'])
+        properties['modified'] = _format_w3cdtf(properties['modified'])
+        return properties
+    
+    def _add_workbook_metadata(self, sheet_names: List[str], properties: Dict[str, Any]) -> None:
         """Add workbook metadata to document structure"""
         try:
             metadata = {
-                'sheets': wb.sheetnames,
-                'properties': {
-                    'title': wb.properties.title if hasattr(wb.properties, 'title') else None,
-                    'subject': wb.properties.subject if hasattr(wb.properties, 'subject') else None,
-                    'creator': wb.properties.creator if hasattr(wb.properties, 'creator') else None,
-                    'created': wb.properties.created.isoformat() if hasattr(wb.properties, 'created') and wb.properties.created else None,
-                    'modified': wb.properties.modified.isoformat() if hasattr(wb.properties, 'modified') and wb.properties.modified else None
-                }
+                'sheets': sheet_names,
+                'properties': properties
             }
             
             self.structure.add_element(DocumentElement(
@@ -91,79 +195,72 @@ class XlsxConverter(BaseDocumentConverter):
         except Exception as e:
             self.log_warning(f"Error extracting workbook metadata: {str(e)}")
     
-    def _has_content(self, sheet: Worksheet) -> bool:
+    def _has_content(self, first_row: Any) -> bool:
         """Check if sheet has any content"""
-        try:
-            # In read_only mode, we need to iterate
-            for row in sheet.iter_rows(min_row=1, max_row=1):
-                return any(cell.value is not None for cell in row)
-            return False
-        except Exception:
-            return False
+        return any(cell not in _EMPTY_VALUES for cell in first_row)
     
-    def _process_sheet(self, sheet: Worksheet) -> None:
-        """Process single worksheet"""
+    def _process_sheet(self, title: str, rows: Any) -> None:
+        """Process single worksheet from an iterable of row values"""
         try:
-            # Add sheet header
+            table_data, max_cols = self._extract_table_data(rows)
+        except Exception as e:
+            self.log_warning(f"Error processing sheet {title}: {str(e)}")
+            table_data, max_cols = [], 0
+        
+        self._add_sheet(title, table_data, max_cols)
+    
+    def _extract_table_data(self, rows: Any) -> Tuple[List[List[str]], int]:
+        """Format rows into a rectangular table, returning (table_data, max_cols)"""
+        table_data = []
+        max_cols = 0
+        format_cell = self._format_cell_value
+        
+        # Process rows
+        for row in rows:
+            # Find the last non-empty cell; fully empty rows are skipped
+            last = len(row)
+            while last and row[last - 1] in _EMPTY_VALUES:
+                last -= 1
+            if last:
+                if last > max_cols:
+                    max_cols = last
+                # Format row data, leaving out empty trailing cells
+                table_data.append([format_cell(row[i]) for i in range(last)])
+        
+        # Ensure all rows have same number of columns
+        for row in table_data:
+            if len(row) < max_cols:
+                row.extend([''] * (max_cols - len(row)))
+        
+        return table_data, max_cols
+    
+    def _add_sheet(self, title: str, table_data: List[List[str]], max_cols: int) -> None:
+        """Add sheet heading and table to document structure"""
+        # Add sheet header
+        self.structure.add_element(DocumentElement(
+            type=ElementType.HEADING,
+            content=f"Sheet: {title}",
+            metadata={'sheet_name': title},
+            level=2
+        ))
+        
+        # Add table to structure if content exists
+        if table_data:
             self.structure.add_element(DocumentElement(
-                type=ElementType.HEADING,
-                content=f"Sheet: {sheet.title}",
-                metadata={'sheet_name': sheet.title},
-                level=2
+                type=ElementType.TABLE,
+                content=table_data,
+                metadata={
+                    'has_headers': True,
+                    'align': ['left'] * max_cols,
+                    'sheet': title
+                }
             ))
-            
-            # Initialize table data
-            table_data = []
-            has_content = False
-            max_cols = 0
-            
-            # Process rows
-            for row_idx, row in enumerate(sheet.iter_rows(values_only=True), 1):
-                if any(cell is not None for cell in row):
-                    has_content = True
-                    # Filter out empty trailing cells
-                    while row and row[-1] is None:
-                        row = row[:-1]
-                    if row:
-                        max_cols = max(max_cols, len(row))
-                        # Format row data
-                        formatted_row = [self._format_cell_value(cell) for cell in row]
-                        table_data.append(formatted_row)
-            
-            # Ensure all rows have same number of columns
-            for row in table_data:
-                while len(row) < max_cols:
-                    row.append('')
-            
-            # Add table to structure if content exists
-            if has_content and table_data:
-                self.structure.add_element(DocumentElement(
-                    type=ElementType.TABLE,
-                    content=table_data,
-                    metadata={
-                        'has_headers': True,
-                        'align': ['left'] * max_cols,
-                        'sheet': sheet.title
-                    }
-                ))
-                
-        except Exception as e:
-            self.log_warning(f"Error processing sheet {sheet.title}: {str(e)}")
     
     def _format_cell_value(self, value: Any) -> str:
         """Format cell value for markdown"""
         if value is None:
             return ''
-            
-        if isinstance(value, datetime):
-            return value.isoformat()
-            
-        if isinstance(value, (int, float)):
-            if isinstance(value, float) and value.is_integer():
-                return str(int(value))
-            return str(value)
-            
-        return str(value)
+        return self._FORMATTERS.get(type(value), str)(value)
     
     def _format_column_width(self, width: Any) -> Optional[int]:
         """Convert Excel column width to character count"""
@@ -1,6 +1,7 @@
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Iterable, Tuple, Callable
 from dataclasses import dataclass, field
 from enum import Enum
+import sys
 
 class ElementType(str, Enum):
     HEADING = "heading"
@@ -15,7 +16,14 @@ class ElementType(str, Enum):
     CITATION = "citation"
     SEPARATOR = "separator"
 
-@dataclass
+# Markdown prefixes for heading levels and list nesting depths
+_HEADING_PREFIXES = tuple('#' * level for level in range(7))
+_LIST_INDENTS = tuple("    " * depth for depth in range(16))
+
+# Slotted dataclasses need Python 3.10+; older interpreters keep a per-instance __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class DocumentElement:
     """Represents a semantic element in the document"""
     type: ElementType
@@ -24,10 +32,26 @@ class DocumentElement:
     level: Optional[int] = None
     children: List['DocumentElement'] = field(default_factory=list)
     
+    # Not annotated, so dataclass treats it as a class attribute, not a field
+    _CONTAINER_TYPES = frozenset({ElementType.HEADING})
+    
     @property
     def is_container(self) -> bool:
         """Check if element can contain other elements"""
-        return self.type in {ElementType.HEADING}
+        return self.type in DocumentElement._CONTAINER_TYPES
+
+class ElementBuffer:
+    """Collects elements produced out of band (worker threads or processes)
+    so they can be merged into a DocumentStructure in document order"""
+    
+    def __init__(self):
+        self.elements: List[DocumentElement] = []
+    
+    def add_element(self, element: DocumentElement) -> None:
+        self.elements.append(element)
+    
+    def extend(self, elements: Iterable[DocumentElement]) -> None:
+        self.elements.extend(elements)
 
 class DocumentStructure:
     """Manages document structure and hierarchy"""
@@ -36,6 +60,7 @@ class DocumentStructure:
         self.elements: List[DocumentElement] = []
         self._current_section: Optional[DocumentElement] = None
         self._section_stack: List[DocumentElement] = []
+        self._render_cache: Dict[int, str] = {}
     
     def add_element(self, element: DocumentElement) -> None:
         """Add element maintaining document hierarchy"""
@@ -46,6 +71,22 @@ class DocumentStructure:
         else:
             self.elements.append(element)
     
+    def extend(self, elements: Iterable[DocumentElement]) -> None:
+        """Add elements in order, resolving the target container once per heading"""
+        target = self._target_list()
+        for element in elements:
+            if element.type == ElementType.HEADING:
+                self._handle_heading(element)
+                target = self._target_list()
+            else:
+                target.append(element)
+    
+    def _target_list(self) -> List[DocumentElement]:
+        """List that non-heading elements are currently appended to"""
+        if self._current_section and self._current_section.is_container:
+            return self._current_section.children
+        return self.elements
+    
     def _handle_heading(self, heading: DocumentElement) -> None:
         """Handle heading hierarchy"""
         # Pop sections of equal or higher level
@@ -66,105 +107,170 @@ class DocumentStructure:
     
     def to_markdown(self) -> str:
         """Convert document structure to markdown"""
-        return self._process_elements(self.elements)
+        md_parts: List[str] = []
+        # Rendered markdown by element identity, so elements shared between
+        # sections are only serialized once; dropped after each render
+        self._render_cache = {}
+        try:
+            self._process_elements(self.elements, md_parts)
+        finally:
+            self._render_cache = {}
+        return '\n\n'.join(md_parts)
     
-    def _process_elements(self, elements: List[DocumentElement], level: int = 0) -> str:
-        """Process list of elements into markdown"""
-        md_parts = []
-        
-        for element in elements:
-            # Process element content
-            content = self._process_element(element, level)
-            if content:
-                md_parts.append(content)
-            
-            # Process children if any
-            if element.children:
-                child_content = self._process_elements(element.children, level + 1)
-                if child_content:
-                    md_parts.append(child_content)
-        
-        return '\n\n'.join(part.strip() for part in md_parts if part.strip())
+    def _process_elements(self, elements: List[DocumentElement], out: List[str], level: int = 0) -> None:
+        """Append the stripped, non-empty markdown of elements and their children to out"""
+        # Pre-order walk with an explicit stack of (children iterator, level)
+        stack = [(iter(elements), level)]
+        while stack:
+            iterator, level = stack[-1]
+            for element in iterator:
+                # Process element content
+                content = self._process_element(element, level)
+                if content:
+                    content = content.strip()
+                    if content:
+                        out.append(content)
+                
+                # Descend into children, resuming this iterator afterwards
+                if element.children:
+                    stack.append((iter(element.children), level + 1))
+                    break
+            else:
+                stack.pop()
     
     def _process_element(self, element: DocumentElement, level: int) -> str:
         """Convert single element to markdown"""
-        if element.type == ElementType.HEADING:
-            return f"{'#' * element.level} {element.content}"
-            
-        elif element.type == ElementType.PARAGRAPH:
-            return str(element.content)
+        cached = self._render_cache.get(id(element))
+        if cached is not None:
+            return cached
+        
+        handler = self._HANDLERS.get(element.type)
+        content = handler(self, element, level) if handler else ""
+        self._render_cache[id(element)] = content
+        return content
+    
+    def _render_heading(self, element: DocumentElement, level: int) -> str:
+        level = element.level
+        prefix = _HEADING_PREFIXES[level] if level < len(_HEADING_PREFIXES) else '#' * level
+        return f"{prefix} {element.content}"
+    
+    def _render_paragraph(self, element: DocumentElement, level: int) -> str:
+        return str(element.content)
+    
+    def _render_list(self, element: DocumentElement, level: int) -> str:
+        # Indentation comes from LIST nesting only, not from the section depth:
+        # a top-level list always starts flush left
+        return self._format_list(element)
+    
+    def _render_table(self, element: DocumentElement, level: int) -> str:
+        if isinstance(element.content, list) and element.content and element.content[0]:
+            headers = element.metadata.get('has_headers', True)
+            align = element.metadata.get('align', ['left'] * len(element.content[0]))
             
-        elif element.type == ElementType.LIST:
-            items = element.content if isinstance(element.content, list) else [element.content]
-            ordered = element.metadata.get('ordered', False)
-            indent = "    " * level
+            # Convert cells to strings once for both measuring and formatting
+            rows = [[str(cell) for cell in row] for row in element.content]
+            return self._format_table(rows, headers, align)
+        return ""
+    
+    def _render_image(self, element: DocumentElement, level: int) -> str:
+        alt = element.metadata.get('alt', 'Image')
+        return f"![{alt}]({element.content})"
+    
+    def _render_code(self, element: DocumentElement, level: int) -> str:
+        lang = element.metadata.get('language', '')
+        return f"```{lang}\n{element.content}\n```"
+    
+    def _render_math(self, element: DocumentElement, level: int) -> str:
+        inline = element.metadata.get('inline', False)
+        if inline:
+            return f"${element.content}$"
+        return f"$$\n{element.content}\n$$"
+    
+    def _render_separator(self, element: DocumentElement, level: int) -> str:
+        return "---"
+    
+    # Element type -> renderer; types without an entry render as ""
+    _HANDLERS = {
+        ElementType.HEADING: _render_heading,
+        ElementType.PARAGRAPH: _render_paragraph,
+        ElementType.LIST: _render_list,
+        ElementType.TABLE: _render_table,
+        ElementType.IMAGE: _render_image,
+        ElementType.CODE: _render_code,
+        ElementType.MATH: _render_math,
+        ElementType.SEPARATOR: _render_separator,
+    }
+    
+    def _format_list(self, element: DocumentElement, depth: int = 0) -> str:
+        """Format a list, rendering nested LIST items one indent level deeper"""
+        items = element.content if isinstance(element.content, list) else [element.content]
+        ordered = element.metadata.get('ordered', False)
+        indent = _LIST_INDENTS[depth] if depth < len(_LIST_INDENTS) else "    " * depth
+        
+        md_lines = []
+        number = 0
+        for item in items:
+            if isinstance(item, DocumentElement):
+                nested = self._format_list(item, depth + 1)
+                if nested:
+                    md_lines.append(nested)
+                continue
             
+            number += 1
             if ordered:
-                return '\n'.join(f"{indent}{i}. {item}" 
-                               for i, item in enumerate(items, 1))
+                md_lines.append(f"{indent}{number}. {item}")
             else:
-                return '\n'.join(f"{indent}- {item}" for item in items)
-                
-        elif element.type == ElementType.TABLE:
-            if isinstance(element.content, list):
-                headers = element.metadata.get('has_headers', True)
-                align = element.metadata.get('align', ['left'] * len(element.content[0]))
-                
-                return self._format_table(element.content, headers, align)
-                
-        elif element.type == ElementType.IMAGE:
-            alt = element.metadata.get('alt', 'Image')
-            return f"![{alt}]({element.content})"
-            
-        elif element.type == ElementType.CODE:
-            lang = element.metadata.get('language', '')
-            return f"```{lang}\n{element.content}\n```"
-            
-        elif element.type == ElementType.MATH:
-            inline = element.metadata.get('inline', False)
-            if inline:
-                return f"${element.content}$"
-            return f"$$\n{element.content}\n$$"
-            
-        elif element.type == ElementType.SEPARATOR:
-            return "---"
-            
-        return ""
+                md_lines.append(f"{indent}- {item}")
+        
+        return '\n'.join(md_lines)
+    
+    def _table_layout(self, rows: List[List[str]], align: List[str] = None) -> Tuple[List[int], str]:
+        """Compute column widths and the alignment separator row for rows of cell strings"""
+        # Calculate column widths, per column in C when the table is rectangular
+        n_cols = len(rows[0])
+        if all(len(row) == n_cols for row in rows):
+            col_widths = [max(map(len, column)) for column in zip(*rows)]
+        else:
+            col_widths = [0] * n_cols
+            for row in rows:
+                for i, cell in enumerate(row):
+                    col_widths[i] = max(col_widths[i], len(cell))
+        
+        # Default left alignment
+        if not align:
+            align = ['left'] * len(col_widths)
+        
+        # Separator with alignment, slicing one dash run sized for the widest column
+        dashes = '-' * max(col_widths, default=0)
+        separators = [
+            f":{dashes[:width]}:" if alignment == 'center' else
+            f"{dashes[:width]}:" if alignment == 'right' else
+            f":{dashes[:width]}"  # left or default
+            for width, alignment in zip(col_widths, align)
+        ]
+        
+        return col_widths, f"|{'|'.join(separators)}|"
     
     def _format_table(self, rows: List[List[str]], 
                      headers: bool = True,
                      align: List[str] = None) -> str:
-        """Format table with alignment support"""
+        """Format table of cell strings with alignment support"""
         if not rows or not rows[0]:
             return ""
-            
-        # Calculate column widths
-        col_widths = [0] * len(rows[0])
-        for row in rows:
-            for i, cell in enumerate(row):
-                col_widths[i] = max(col_widths[i], len(str(cell)))
         
-        # Default left alignment
-        if not align:
-            align = ['left'] * len(col_widths)
+        col_widths, separator = self._table_layout(rows, align)
+        # Parse the padding specs once per table: one template for full rows,
+        # per-column formatters for ragged ones
+        col_specs = [" {:<%d} " % width for width in col_widths]
+        row_fmt = f"|{'|'.join(col_specs)}|".format
+        col_fmts = [spec.format for spec in col_specs]
         
         # Build table
         md_lines = []
         
         # Header/first row
-        md_lines.append(self._format_row(rows[0], col_widths))
-        
-        # Separator with alignment
-        separators = []
-        for width, alignment in zip(col_widths, align):
-            if alignment == 'center':
-                sep = f":{'-' * (width)}:"
-            elif alignment == 'right':
-                sep = f"{'-' * (width)}:"
-            else:  # left or default
-                sep = f":{'-' * (width)}"
-            separators.append(sep)
-        md_lines.append(f"|{'|'.join(separators)}|")
+        md_lines.append(self._format_row(rows[0], row_fmt, col_fmts))
+        md_lines.append(separator)
         
         # Data rows
         if headers:
@@ -173,14 +279,15 @@ class DocumentStructure:
             start_idx = 0
         
         for row in rows[start_idx:]:
-            md_lines.append(self._format_row(row, col_widths))
+            md_lines.append(self._format_row(row, row_fmt, col_fmts))
         
         return '\n'.join(md_lines)
     
-    def _format_row(self, row: List[str], widths: List[int]) -> str:
-        """Format table row with proper cell padding"""
-        cells = []
-        for cell, width in zip(row, widths):
-            cell_str = str(cell).replace('|', '\\|')
-            cells.append(f" {cell_str:<{width}} ")
-        return f"|{'|'.join(cells)}|"
\ No newline at end of file
+    def _format_row(self, row: List[str], row_fmt: Callable[..., str],
+                    col_fmts: List[Callable[[str], str]]) -> str:
+        """Format table row of cell strings with proper cell padding"""
+        cells = [cell.replace('|', '\\|') for cell in row]
+        if len(cells) == len(col_fmts):
+            return row_fmt(*cells)
+        # Ragged row: pad the cells present, dropping any beyond the header width
+        return f"|{'|'.join([fmt(cell) for fmt, cell in zip(col_fmts, cells)])}|"
\ No newline at end of file
@@ -1,14 +1,77 @@
 import os
 import tempfile
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, BinaryIO
 from loguru import logger
-import base64
+try:
+    # SIMD-accelerated drop-in replacement for the stdlib encoder
+    import pybase64 as base64
+except ImportError:
+    import base64
+try:
+    # libuchardet bindings with the same detector API as chardet
+    from cchardet import UniversalDetector
+except ImportError:
+    from chardet.universaldetector import UniversalDetector
 from PIL import Image
 import io
 import magic
 import hashlib
 from datetime import datetime
 import mimetypes
+import re
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+_HASH_CHUNK_SIZE = 1 << 20
+_ENCODING_CHUNK_SIZE = 64 * 1024
+_CLEANUP_WORKERS = 8
+# Enough leading bytes for libmagic to tell OOXML packages apart from plain zips
+_MAGIC_HEADER_SIZE = 64 * 1024
+
+# Anything outside the characters normalize_filename keeps
+_RE_INVALID_FILENAME_CHARS = re.compile(r'[^-_.() A-Za-z0-9]')
+
+# libmagic loads its compiled database per instance, so share one lazily
+_MIME: Optional[magic.Magic] = None
+
+def _get_mime() -> magic.Magic:
+    """Shared MIME-type detector; python-magic serializes calls with a lock"""
+    global _MIME
+    if _MIME is None:
+        _MIME = magic.Magic(mime=True)
+    return _MIME
+
+# Leading bytes of common image formats, named as PIL reports them (lowercased)
+_IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpeg'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+)
+
+def _sniff_image_format(data: bytes) -> Optional[str]:
+    """Image format from the file signature, or None if not a common format"""
+    for signature, image_format in _IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return image_format
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+def _safe_unlink(file_path: str) -> None:
+    """Remove a file, ignoring ones that are already gone"""
+    try:
+        os.unlink(file_path)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Error cleaning up temp file {file_path}: {str(e)}")
+
+@lru_cache(maxsize=4096)
+def _extension_for_inode(dev: int, ino: int, mtime_ns: int, path: str) -> str:
+    """Extension guessed from a file's MIME type; the stat fields in the key
+    make a replaced or modified file miss the cache"""
+    return mimetypes.guess_extension(_get_mime().from_file(path)) or ''
 
 class FileUtils:
     """Utility class for file operations"""
@@ -16,23 +79,27 @@ class FileUtils:
     @staticmethod
     def create_temp_file(content: bytes, suffix: str) -> str:
         """Create a temporary file with the given content and suffix"""
-        temp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+        fd, name = tempfile.mkstemp(suffix=suffix)
         try:
-            temp.write(content)
-            temp.flush()
-            return temp.name
+            # os.write may write less than asked for large buffers
+            view = memoryview(content)
+            while view:
+                view = view[os.write(fd, view):]
+            return name
         finally:
-            temp.close()
+            os.close(fd)
     
     @staticmethod
     def cleanup_temp_files(files: List[str]) -> None:
         """Clean up temporary files"""
-        for file_path in files:
-            try:
-                if os.path.exists(file_path):
-                    os.unlink(file_path)
-            except Exception as e:
-                logger.warning(f"Error cleaning up temp file {file_path}: {str(e)}")
+        if len(files) < 2:
+            for file_path in files:
+                _safe_unlink(file_path)
+            return
+        
+        # unlink releases the GIL while the filesystem updates its metadata
+        with ThreadPoolExecutor(max_workers=min(_CLEANUP_WORKERS, len(files))) as executor:
+            list(executor.map(_safe_unlink, files))
     
     @staticmethod
     def encode_image(image_data: bytes, format: str = 'PNG', max_size_kb: int = 500) -> Optional[str]:
@@ -41,11 +108,19 @@ class FileUtils:
         Returns: base64 encoded image string or None if conversion fails
         """
         try:
-            # Convert image format if needed
+            # Opening only parses the header; pixels are decoded on first use
             img = Image.open(io.BytesIO(image_data))
+            format = format.upper()
+            mime_type = f"image/{format.lower()}"
             
-            # Calculate target size if needed
+            # Already small enough and in the target format: embed as-is
             current_size = len(image_data) / 1024  # KB
+            if (current_size <= max_size_kb and img.format == format
+                    and not (format == 'JPEG' and img.mode in ('RGBA', 'LA'))):
+                encoded = base64.b64encode(image_data).decode('ascii')
+                return f"data:{mime_type};base64,{encoded}"
+            
+            # Calculate target size if needed
             if current_size > max_size_kb:
                 scale_factor = (max_size_kb / current_size) ** 0.5
                 new_width = int(img.width * scale_factor)
@@ -55,7 +130,7 @@ class FileUtils:
             # Convert to desired format
             output = io.BytesIO()
             
-            if format.upper() == 'JPEG':
+            if format == 'JPEG':
                 # Convert RGBA to RGB if needed
                 if img.mode in ('RGBA', 'LA'):
                     background = Image.new('RGB', img.size, (255, 255, 255))
@@ -65,9 +140,7 @@ class FileUtils:
             else:
                 img.save(output, format=format, optimize=True)
             
-            image_data = output.getvalue()
-            encoded = base64.b64encode(image_data).decode('utf-8')
-            mime_type = f"image/{format.lower()}"
+            encoded = base64.b64encode(output.getbuffer()).decode('ascii')
             return f"data:{mime_type};base64,{encoded}"
             
         except Exception as e:
@@ -78,27 +151,39 @@ class FileUtils:
     def get_file_metadata(file_path: str) -> Dict[str, Any]:
         """Get comprehensive file metadata"""
         try:
-            stats = os.stat(file_path)
-            mime = magic.Magic(mime=True)
+            mime = _get_mime()
+            
+            # Stat, type detection and hashing share a single open file
+            with open(file_path, 'rb') as f:
+                stats = os.fstat(f.fileno())
+                mime_type = mime.from_buffer(f.read(_MAGIC_HEADER_SIZE))
+                f.seek(0)
+                # Calculate file hash in fixed-size chunks rather than reading it whole
+                sha256 = FileUtils._sha256_file(f)
             
-            metadata = {
+            return {
                 'size_bytes': stats.st_size,
                 'created': datetime.fromtimestamp(stats.st_ctime).isoformat(),
                 'modified': datetime.fromtimestamp(stats.st_mtime).isoformat(),
-                'mime_type': mime.from_file(file_path),
+                'mime_type': mime_type,
                 'extension': os.path.splitext(file_path)[1].lower(),
-                'filename': os.path.basename(file_path)
+                'filename': os.path.basename(file_path),
+                'sha256': sha256
             }
-            
-            # Calculate file hash
-            with open(file_path, 'rb') as f:
-                metadata['sha256'] = hashlib.sha256(f.read()).hexdigest()
-            
-            return metadata
         except Exception as e:
             logger.error(f"Error getting file metadata: {str(e)}")
             return {}
     
+    @staticmethod
+    def _sha256_file(f: BinaryIO) -> str:
+        """SHA-256 hex digest of an open binary file, read incrementally"""
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+        return digest.hexdigest()
+    
     @staticmethod
     def is_valid_image(image_data: bytes, allowed_formats: List[str] = None) -> bool:
         """
@@ -107,23 +192,23 @@ class FileUtils:
             image_data: Raw image bytes
             allowed_formats: List of allowed format extensions (e.g., ['jpg', 'png'])
         """
-        try:
-            img = Image.open(io.BytesIO(image_data))
-            if allowed_formats:
-                return img.format.lower() in [fmt.lower() for fmt in allowed_formats]
-            return True
-        except Exception:
-            return False
+        # Recognize common formats from their signature without involving PIL
+        image_format = _sniff_image_format(image_data)
+        if image_format is None:
+            try:
+                image_format = Image.open(io.BytesIO(image_data)).format.lower()
+            except Exception:
+                return False
+        
+        if allowed_formats:
+            return image_format in [fmt.lower() for fmt in allowed_formats]
+        return True
     
     @staticmethod
     def normalize_filename(filename: str) -> str:
         """Normalize filename removing invalid characters"""
-        # Remove invalid characters
-        valid_chars = '-_.() abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
-        filename = ''.join(c for c in filename if c in valid_chars)
-        
-        # Ensure it's not empty
-        filename = filename.strip() or 'unnamed_file'
+        # Remove invalid characters and ensure it's not empty
+        filename = _RE_INVALID_FILENAME_CHARS.sub('', filename).strip() or 'unnamed_file'
         
         # Limit length
         max_length = 255
@@ -138,8 +223,9 @@ class FileUtils:
         """Get safe file extension with fallback to mime type"""
         ext = os.path.splitext(filename)[1].lower()
         if not ext:
-            mime_type = magic.from_file(filename, mime=True)
-            ext = mimetypes.guess_extension(mime_type) or ''
+            # Unchanged files keep their detected type, keyed by inode and mtime
+            stats = os.stat(filename)
+            ext = _extension_for_inode(stats.st_dev, stats.st_ino, stats.st_mtime_ns, filename)
         return ext.lstrip('.')
     
     @staticmethod
@@ -153,11 +239,15 @@ class FileUtils:
     def get_file_encoding(file_path: str) -> str:
         """Detect file encoding"""
         try:
-            import chardet
+            # Feed chunks until the detector is confident instead of reading it whole
+            detector = UniversalDetector()
             with open(file_path, 'rb') as f:
-                raw = f.read()
-                result = chardet.detect(raw)
-                return result['encoding'] or 'utf-8'
+                for chunk in iter(lambda: f.read(_ENCODING_CHUNK_SIZE), b''):
+                    detector.feed(chunk)
+                    if detector.done:
+                        break
+            detector.close()
+            return detector.result['encoding'] or 'utf-8'
         except Exception as e:
             logger.warning(f"Error detecting file encoding: {str(e)}")
             return 'utf-8'  # Default to UTF-8
@@ -25,7 +25,6 @@ class CrawlerService:
         self.worker_threads = worker_threads
         self.scraper = WebScraper(max_concurrent=max_concurrent)
         self.active_crawls: Dict[uuid.UUID, CrawlerResponse] = {}
-        self._lock = asyncio.Lock()
         self._executor = ThreadPoolExecutor(max_workers=worker_threads)
         self._semaphore = asyncio.Semaphore(max_concurrent)
 
@@ -64,30 +63,47 @@ class CrawlerService:
                         url
                     )
                     
-                    async with self._lock:
-                        for link in new_links:
-                            await queue_manager.add_url(link, depth + 1, url)
+                    await queue_manager.add_urls(new_links, depth + 1, url)
                 
-                # Store the page
-                async with self._lock:
-                    response.pages.append(page)
-                    response.stats.success_count += 1
-                    logger.info(f"Successfully processed {url}")
+                # Store the page; response state is per crawl and only touched
+                # from the event loop, so updates without an await in between
+                # need no lock
+                response.pages.append(page)
+                response.stats.success_count += 1
+                logger.info(f"Successfully processed {url}")
             
             else:
-                async with self._lock:
-                    response.stats.failed_count += 1
+                response.stats.failed_count += 1
                 logger.error(f"Failed to scrape {url}")
                 
         except Exception as e:
-            async with self._lock:
-                response.stats.failed_count += 1
+            response.stats.failed_count += 1
             logger.error(f"Error processing {url}: {str(e)}")
             
         finally:
             await queue_manager.mark_complete(url)
 
     
+    async def _crawl_worker(self, queue_manager: QueueManager,
+                            link_extractor: LinkExtractor,
+                            response: CrawlerResponse,
+                            request: CrawlerRequest) -> None:
+        """Process URLs from the queue until the crawl is complete"""
+        while len(response.pages) < request.max_pages:
+            url = await queue_manager.wait_next_url()
+            if url is None:
+                logger.debug("Queue is complete, worker exiting")
+                return
+            
+            await self._process_page(
+                url=url,
+                depth=queue_manager.get_depth(url),
+                queue_manager=queue_manager,
+                link_extractor=link_extractor,
+                response=response,
+                request=request
+            )
+    
     async def crawl_sync(self, request: CrawlerRequest) -> CrawlerResponse:
         """
         Perform synchronous crawl and wait for completion.
@@ -97,6 +113,7 @@ class CrawlerService:
         # Initialize components
         queue_manager = QueueManager(request)
         link_extractor = LinkExtractor(request)
+        await link_extractor.load_robots_txt()
         
         # Create response object
         response = CrawlerResponse(
@@ -116,55 +133,25 @@ class CrawlerService:
             logger.debug("Adding initial URL to queue")
             await queue_manager.add_url(str(request.url))
             
-            while True:
-                # Check completion conditions first
-                if queue_manager.is_complete:
-                    logger.debug("Queue is complete, breaking")
-                    break
-
-                if len(response.pages) >= request.max_pages:
-                    logger.info(f"Reached max pages limit: {request.max_pages}")
-                    break
-
-                # Get URLs to process
-                processing_urls = []
-                async with self._lock:
-                    # Get batch of URLs to process
-                    remaining_slots = request.max_pages - len(response.pages)
-                    batch_size = min(self.worker_threads, remaining_slots)
-                    
-                    for _ in range(batch_size):
-                        url = await queue_manager.get_next_url()
-                        if url:
-                            processing_urls.append(url)
-                
-                if not processing_urls:
-                    # No URLs available, check if we're really done
-                    if not queue_manager.in_progress and queue_manager.queue.empty():
-                        logger.debug("No URLs in queue and none in progress, breaking")
-                        break
-                    await asyncio.sleep(0.1)
-                    continue
-                
-                # Process URLs in parallel
-                tasks = []
-                for url in processing_urls:
-                    depth = queue_manager.get_depth(url)
-                    task = asyncio.create_task(
-                        self._process_page(
-                            url=url,
-                            depth=depth,
-                            queue_manager=queue_manager,
-                            link_extractor=link_extractor,
-                            response=response,
-                            request=request
-                        )
-                    )
-                    tasks.append(task)
-                
-                if tasks:
-                    await asyncio.gather(*tasks)
-                    logger.debug(f"Processed batch of {len(tasks)} URLs")
+            # Workers pull URLs as soon as they are queued; the crawl ends when
+            # the queue is empty and no page is still being processed
+            workers = [
+                asyncio.create_task(self._crawl_worker(
+                    queue_manager=queue_manager,
+                    link_extractor=link_extractor,
+                    response=response,
+                    request=request
+                ))
+                for _ in range(self.max_concurrent)
+            ]
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                for worker in workers:
+                    worker.cancel()
+            
+            if len(response.pages) >= request.max_pages:
+                logger.info(f"Reached max pages limit: {request.max_pages}")
             
             # Update final statistics
             response.status = CrawlStatus.COMPLETED
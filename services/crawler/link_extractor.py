@@ -1,12 +1,35 @@
-from typing import List, Set, Optional
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+from typing import Dict, List, Set, Optional, Tuple
+from urllib.parse import urljoin, urlparse, urlunparse, unquote
+import lxml.html
+from lxml import etree
 import re
 from loguru import logger
 import robotexclusionrulesparser
-import requests
+import httpx
 from models.crawler_request import CrawlerRequest
 
+# Percent-encoded "/" kept encoded when robots.txt paths are compared
+_RE_ENCODED_SLASH = re.compile("%2[fF]")
+
+_HTTP_SCHEMES = ("http://", "https://")
+
+# Conservative check for numbered group references (\1, (?(1)...)) in user patterns
+_RE_NUMBERED_BACKREF = re.compile(r"\\[1-9]|\(\?\(\d")
+
+def _combine_patterns(patterns: List[re.Pattern]) -> List[re.Pattern]:
+    """
+    Fold patterns into a single alternation that matches wherever any of them does.
+    
+    Patterns with numbered group references (their group numbers would shift),
+    or that cannot be combined (e.g. inline global flags), are kept as they are.
+    """
+    if len(patterns) < 2 or any(_RE_NUMBERED_BACKREF.search(p.pattern) for p in patterns):
+        return patterns
+    try:
+        return [re.compile("|".join(f"(?:{p.pattern})" for p in patterns))]
+    except re.error:
+        return patterns
+
 class LinkExtractor:
     """
     Extracts and validates links from HTML content.
@@ -21,29 +44,96 @@ class LinkExtractor:
             request (CrawlerRequest): The crawler request containing settings
         """
         self.base_domain = urlparse(str(request.url)).netloc
+        # Absolute http(s) URLs on the crawled host, matched by prefix
+        self._base_prefixes = (f"http://{self.base_domain}/", f"https://{self.base_domain}/")
+        self._base_roots = (f"http://{self.base_domain}", f"https://{self.base_domain}")
         self.exclude_patterns = [re.compile(p) for p in request.exclude_patterns] if request.exclude_patterns else []
         self.include_patterns = [re.compile(p) for p in request.include_patterns] if request.include_patterns else []
+        # Each list folded into one alternation, so a URL is scanned once per list
+        self._exclude_matchers = _combine_patterns(self.exclude_patterns)
+        self._include_matchers = _combine_patterns(self.include_patterns)
         self.respect_robots = request.respect_robots_txt
         self._robots_parser = robotexclusionrulesparser.RobotExclusionRulesParser()
-        self._load_robots_txt(str(request.url))
+        # Rules for user agent "*" compiled into one pattern; see _compile_robots_rules
+        self._robots_pattern: Optional[re.Pattern] = None
+        self._robots_allowed: Tuple[bool, ...] = ()
+        # Filter and robots.txt outcome per normalized URL for this crawl
+        self._url_decisions: Dict[str, bool] = {}
+        self._start_url = str(request.url)
 
-    def _load_robots_txt(self, url: str) -> None:
-        """Load and parse robots.txt if it exists"""
+    async def load_robots_txt(self) -> None:
+        """
+        Load and parse robots.txt if it exists.
+        
+        Awaited by the crawler before extracting links, so the fetch does not
+        block the event loop.
+        """
         try:
             if self.respect_robots:
-                parsed_url = urlparse(url)
+                parsed_url = urlparse(self._start_url)
                 robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-                response = requests.get(robots_url, timeout=10)
+                async with httpx.AsyncClient(timeout=10, follow_redirects=True) as client:
+                    response = await client.get(robots_url)
                 if response.status_code == 200:
                     self._robots_parser.parse(response.text)
+                    self._compile_robots_rules()
         except Exception as e:
             logger.warning(f"Failed to load robots.txt: {e}")
 
+    def _compile_robots_rules(self) -> None:
+        """
+        Compile the robots.txt rules that apply to user agent "*" into a single
+        anchored alternation, one group per rule in file order.
+        
+        The parser interprets every rule again on each is_allowed call. Regex
+        alternation tries branches left to right, so the first group that
+        matches is the first matching rule, as in the parser; its result is
+        looked up in self._robots_allowed.
+        """
+        # The parser does not expose its rulesets publicly
+        rulesets = getattr(self._robots_parser, '_RobotExclusionRulesParser__rulesets', None)
+        if rulesets is None:
+            return
+        ruleset = next((r for r in rulesets if r.does_user_agent_match("*")), None)
+        if ruleset is None or not ruleset.rules:
+            return
+        
+        branches = []
+        allowed = []
+        for rule_type, path in ruleset.rules:
+            is_allow = rule_type == ruleset.ALLOW
+            if "*" in path or path.endswith("$"):
+                # Wildcard syntax, translated as the parser does
+                anchor = "$" if path.endswith("$") else ""
+                if anchor:
+                    path = path[:-1]
+                path = re.sub(r'\*+', '*', path)
+                branches.append(".*".join(re.escape(part) for part in path.split("*")) + anchor)
+            else:
+                branches.append(re.escape(path))
+                # A blank path means "nothing": "Disallow:" allows everything
+                if not path:
+                    is_allow = not is_allow
+            allowed.append(is_allow)
+        
+        self._robots_pattern = re.compile("|".join(f"({branch})" for branch in branches))
+        self._robots_allowed = tuple(allowed)
+
     def _is_allowed_by_robots(self, url: str) -> bool:
         """Check if URL is allowed by robots.txt"""
         if not self.respect_robots:
             return True
-        return self._robots_parser.is_allowed("*", url)
+        if self._robots_pattern is None:
+            return self._robots_parser.is_allowed("*", url)
+        
+        # Rules apply to the path onwards, percent-decoded except for "/"
+        _, _, path, params, query, fragment = urlparse(url)
+        target = urlunparse(("", "", path, params, query, fragment))
+        target = _RE_ENCODED_SLASH.sub("\n", target)
+        target = unquote(target).replace("\n", "%2F")
+        
+        match = self._robots_pattern.match(target)
+        return self._robots_allowed[match.lastindex - 1] if match else True
 
     def _normalize_url(self, url: str, base_url: str) -> Optional[str]:
         """Normalize URL to absolute form and clean it"""
@@ -76,18 +166,20 @@ class LinkExtractor:
         Returns:
             bool: True if URL should be included
         """
-        # Check domain
-        if urlparse(url).netloc != self.base_domain:
-            return False
+        # Check domain; the netloc of an http(s) URL ends at the first "/"
+        # after "://" (normalized URLs carry no query or fragment)
+        if not (url.startswith(self._base_prefixes) or url in self._base_roots):
+            if url.startswith(_HTTP_SCHEMES) or urlparse(url).netloc != self.base_domain:
+                return False
 
         # Check exclude patterns
-        for pattern in self.exclude_patterns:
+        for pattern in self._exclude_matchers:
             if pattern.search(url):
                 return False
 
         # Check include patterns
-        if self.include_patterns:
-            return any(pattern.search(url) for pattern in self.include_patterns)
+        if self._include_matchers:
+            return any(pattern.search(url) for pattern in self._include_matchers)
 
         return True
 
@@ -104,22 +196,45 @@ class LinkExtractor:
         """
         valid_links: Set[str] = set()
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            if not html or not html.strip():
+                return valid_links
+            
+            # Parse with libxml2; passing UTF-8 bytes with an explicit encoding
+            # also accepts pages that carry an XML encoding declaration
+            parser = lxml.html.HTMLParser(encoding='utf-8')
+            tree = lxml.html.document_fromstring(html.encode('utf-8', 'replace'), parser=parser)
+            
+            # Hrefs repeated on this page (navigation, pagination) are only
+            # resolved once against base_url
+            normalized_hrefs: Dict[str, Optional[str]] = {}
             
             # Find all links
-            for link in soup.find_all('a', href=True):
-                url = link['href']
+            for link in tree.iter('a'):
+                url = link.get('href')
+                if url is None:
+                    continue
                 
                 # Normalize URL
-                normalized_url = self._normalize_url(url, base_url)
-                if not normalized_url:
+                if url in normalized_hrefs:
+                    normalized_url = normalized_hrefs[url]
+                else:
+                    normalized_url = normalized_hrefs[url] = self._normalize_url(url, base_url)
+                if not normalized_url or normalized_url in valid_links:
                     continue
 
-                # Apply all filters
-                if (self._should_include_url(normalized_url) and 
-                    self._is_allowed_by_robots(normalized_url)):
+                # Apply all filters; the outcome only depends on the URL, so it
+                # is kept for the links every page of the site repeats
+                allowed = self._url_decisions.get(normalized_url)
+                if allowed is None:
+                    allowed = (self._should_include_url(normalized_url) and 
+                               self._is_allowed_by_robots(normalized_url))
+                    self._url_decisions[normalized_url] = allowed
+                if allowed:
                     valid_links.add(normalized_url)
 
+        except etree.ParserError as e:
+            # Pages without any elements (e.g. only comments) have no links
+            logger.debug(f"No parseable HTML at {base_url}: {e}")
         except Exception as e:
             logger.error(f"Error extracting links from {base_url}: {e}")
 
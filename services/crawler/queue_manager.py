@@ -1,4 +1,4 @@
-from typing import Set, Optional, Dict
+from typing import Set, Optional, Dict, Iterable
 import asyncio
 from collections import deque
 from datetime import datetime
@@ -30,6 +30,8 @@ class QueueManager:
         self.rate_limit_delay = 0.0  # seconds between requests
         self.last_request_time = 0.0
         self._lock = asyncio.Lock()
+        # Set whenever a URL is queued or completed, to wake idle workers
+        self._changed = asyncio.Event()
 
     async def add_url(self, url: str, depth: int = 0, parent_url: Optional[str] = None) -> bool:
         """
@@ -52,10 +54,46 @@ class QueueManager:
                 self.seen_urls.add(url)
                 self.url_depths[url] = depth
                 await self.queue.put(url)
+                self._changed.set()
                 logger.debug(f"Added URL to queue: {url} (depth: {depth})")
                 return True
             return False
 
+    async def add_urls(self, urls: Iterable[str], depth: int = 0, parent_url: Optional[str] = None) -> int:
+        """
+        Add several URLs found on one page, taking the lock once.
+        
+        Applies the same checks as add_url to each URL in order.
+        
+        Args:
+            urls (Iterable[str]): URLs to add
+            depth (int): Depth of the URLs in the crawl tree
+            parent_url (Optional[str]): URL that led to these URLs
+            
+        Returns:
+            int: Number of URLs added
+        """
+        if depth > self.max_depth:
+            return 0
+        
+        added = 0
+        async with self._lock:
+            for url in urls:
+                if len(self.seen_urls) >= self.max_pages:
+                    break
+                if url not in self.seen_urls:
+                    self.seen_urls.add(url)
+                    self.url_depths[url] = depth
+                    # The queue is unbounded, so this never has to wait
+                    self.queue.put_nowait(url)
+                    added += 1
+            if added:
+                self._changed.set()
+        
+        if added:
+            logger.debug(f"Added {added} URLs to queue from {parent_url} (depth: {depth})")
+        return added
+
     async def get_next_url(self) -> Optional[str]:
         """
         Get the next URL to crawl, respecting rate limits.
@@ -68,24 +106,47 @@ class QueueManager:
             #     return None
             if self.queue.empty():
                 return None
+            return await self._take_url()
 
-            # Apply rate limiting
-            current_time = time.time()
-            time_since_last = current_time - self.last_request_time
-            if time_since_last < self.rate_limit_delay:
-                await asyncio.sleep(self.rate_limit_delay - time_since_last)
+    async def wait_next_url(self) -> Optional[str]:
+        """
+        Get the next URL to crawl, waiting while the queue is empty but URLs
+        are still in progress (they may add new links).
+        
+        Returns:
+            Optional[str]: Next URL to crawl or None once the crawl is complete
+        """
+        while True:
+            async with self._lock:
+                if self.is_complete:
+                    return None
+                if not self.queue.empty():
+                    return await self._take_url()
+                # Cleared under the lock, so a set() from add/complete after
+                # this point is not missed
+                self._changed.clear()
+            await self._changed.wait()
 
-            # url = self.queue.popleft()
-            url = await self.queue.get()
-            self.in_progress.add(url)
-            self.last_request_time = time.time()
-            
-            return url
+    async def _take_url(self) -> str:
+        """Dequeue a URL and mark it in progress; caller holds the lock"""
+        # Apply rate limiting
+        current_time = time.time()
+        time_since_last = current_time - self.last_request_time
+        if time_since_last < self.rate_limit_delay:
+            await asyncio.sleep(self.rate_limit_delay - time_since_last)
+
+        # url = self.queue.popleft()
+        url = self.queue.get_nowait()
+        self.in_progress.add(url)
+        self.last_request_time = time.time()
+        
+        return url
 
     async def mark_complete(self, url: str) -> None:
         """Mark a URL as completed"""
         async with self._lock:
             self.in_progress.discard(url)
+            self._changed.set()
 
     def get_depth(self, url: str) -> int:
         """Get the depth of a URL"""
@@ -94,13 +155,13 @@ class QueueManager:
     @property
     def is_complete(self) -> bool:
         """Check if crawling is complete"""
-        return not self.queue and not self.in_progress
+        return self.queue.empty() and not self.in_progress
 
     @property
     def stats(self) -> Dict:
         """Get current queue statistics"""
         return {
-            "queued": len(self.queue),
+            "queued": self.queue.qsize(),
             "in_progress": len(self.in_progress),
             "total_seen": len(self.seen_urls)
         }
\ No newline at end of file
@@ -11,7 +11,6 @@ from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 import html2text
 from loguru import logger
-import base64
 import re, sys
 import asyncio
 from functools import wraps
@@ -906,11 +905,12 @@ class BrowserContext:
         """Take screenshot with enhanced error handling and logging"""
         logger.debug("Attempting to take screenshot")
         try:
-            screenshot = await asyncio.get_event_loop().run_in_executor(
+            # WebDriver already returns the screenshot base64-encoded;
+            # get_screenshot_as_png would decode it only for us to re-encode it
+            encoded = await asyncio.get_event_loop().run_in_executor(
                 None,
-                lambda: self.browser.get_screenshot_as_png()
+                lambda: self.browser.get_screenshot_as_base64()
             )
-            encoded = base64.b64encode(screenshot).decode('utf-8')
             logger.debug(f"Screenshot captured successfully, size: {len(encoded)} bytes")
             return encoded
         except Exception as e:
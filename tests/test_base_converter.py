@@ -0,0 +1,26 @@
+from typing import Tuple
+
+from models.file_conversion_models import FileMetadata
+from services.converters.base_converter import BaseDocumentConverter, ConversionContext
+
+
+class _Converter(BaseDocumentConverter):
+    async def convert(self, content: bytes, context: ConversionContext) -> Tuple[str, FileMetadata]:
+        raise NotImplementedError
+
+
+def test_clean_text_replaces_format_characters():
+    # Zero-width space and BOM are blanked like other control characters
+    assert _Converter()._clean_text("a\u200bb\ufeff") == "a b"
+
+
+def test_clean_text_replaces_control_characters():
+    assert _Converter()._clean_text("a\x00b\u00adc\u202ed\ue000e") == "a b c d e"
+
+
+def test_clean_text_replaces_ascii_control_characters():
+    assert _Converter()._clean_text("a\x00b\x1bc\x7fd\re") == "a b c d e"
+
+
+def test_clean_text_normalizes_whitespace():
+    assert _Converter()._clean_text("  a \t b\n\n\n\n c  ") == "a b\n\nc"
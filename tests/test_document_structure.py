@@ -0,0 +1,26 @@
+from services.converters.document_structure import DocumentElement, DocumentStructure, ElementType
+
+
+def _render(*elements: DocumentElement) -> str:
+    structure = DocumentStructure()
+    for element in elements:
+        structure.add_element(element)
+    return structure.to_markdown()
+
+
+def test_nested_list_indents_one_level_per_depth():
+    nested = DocumentElement(type=ElementType.LIST, content=['b'])
+    root = DocumentElement(type=ElementType.LIST, content=['a', nested, 'c'])
+    assert _render(root) == "- a\n    - b\n- c"
+
+
+def test_list_under_heading_renders_flush_left():
+    heading = DocumentElement(type=ElementType.HEADING, content='Title', level=1)
+    nested = DocumentElement(type=ElementType.LIST, content=['b'])
+    root = DocumentElement(type=ElementType.LIST, content=['a', nested], metadata={'ordered': True})
+    assert _render(heading, root) == "# Title\n\n1. a\n    - b"
+
+
+def test_list_starting_below_top_level_renders_flush_left():
+    root = DocumentElement(type=ElementType.LIST, content=['a', 'b'], metadata={'level': 1})
+    assert _render(root) == "- a\n- b"
@@ -0,0 +1,44 @@
+import asyncio
+from datetime import date, datetime
+from io import BytesIO
+
+from openpyxl import Workbook
+
+from services.converters.base_converter import ConversionContext
+from services.converters.converters.xlsx_converter import XlsxConverter
+
+
+def _workbook_bytes() -> bytes:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(['Day', 'When'])
+    ws.append([date(2024, 1, 2), datetime(2024, 1, 2, 3, 4, 5)])
+    ws['A2'].number_format = 'yyyy-mm-dd'
+    wb.properties.created = datetime(2024, 1, 2, 3, 4, 5)
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def _convert(content: bytes, filename: str):
+    converter = XlsxConverter()
+    context = ConversionContext(filename=filename, size_bytes=len(content), source_format='xlsx')
+    markdown, _ = asyncio.run(converter.convert(content, context))
+    return markdown, converter.structure.elements[0].content
+
+
+def test_date_cells_match_across_backends():
+    content = _workbook_bytes()
+    # .xlsm files always go through openpyxl, .xlsx prefers calamine
+    calamine_md, _ = _convert(content, 'book.xlsx')
+    openpyxl_md, _ = _convert(content, 'book.xlsm')
+    assert '2024-01-02T00:00:00' in openpyxl_md
+    assert calamine_md == openpyxl_md
+
+
+def test_core_properties_match_across_backends():
+    content = _workbook_bytes()
+    _, calamine_meta = _convert(content, 'book.xlsx')
+    _, openpyxl_meta = _convert(content, 'book.xlsm')
+    assert calamine_meta['properties']['created'] == '2024-01-02T03:04:05'
+    assert calamine_meta == openpyxl_meta